@@ -0,0 +1,182 @@
+"""
+Benchmark response serialization for every schema in schemas/question.py.
+
+For each response schema the default FastAPI path (validate the ORM object
+against the response_model, dump it to JSON-compatible data and encode it
+with the stdlib encoder) is compared with the FAST_JSON path in
+utils/serialization.py (copy declared fields straight from the object, encode
+with orjson). Both outputs are decoded and compared, so the benchmark also
+checks that the fast path returns the same document. Request schemas are
+timed for parsing a JSON body.
+
+Needs no database: objects are built in memory at realistic sizes.
+
+    python benchmarks/bench_serialization.py --questions 10 100 --page-sizes 50 200 \
+        --output serialization.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "question"))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import TypeAdapter
+from models.question import Question as QuestionORM, Topic as TopicORM
+from schemas.question import (
+    Page, AnswerOption, Question, TopicRead, QuizComposition, ImportRowError, ImportReport,
+    QuestionCreate, TopicCreate, TopicFilters, QuestionFilters, QuizCompositionFilters,
+)
+from utils.serialization import dump, encode, orjson
+
+NOW = datetime(2025, 12, 1, 12, 0, 0, 123456)
+
+
+def make_topic(idx: int = 0) -> TopicORM:
+    return TopicORM(id=str(uuid.uuid4()), name=f"Topic {idx}", description="Questions about a topic. " * 4)
+
+
+def question_body(topic_id: str, idx: int) -> dict:
+    return {
+        "topic_id": topic_id,
+        "name": f"q{idx}",
+        "question": f"Which event happened in year {1800 + idx}? " * 2,
+        "options": [{"num": n, "text": f"Option {n} for question {idx}"} for n in range(1, 5)],
+        "correct_option": random.randint(1, 4),
+        "explanation": "Because the history books say so. " * 3,
+    }
+
+
+def make_question(topic_id: str, idx: int) -> QuestionORM:
+    return QuestionORM(
+        id=str(uuid.uuid4()), created_at=NOW, updated_at=None, random_key=random.random(),
+        **question_body(topic_id, idx),
+    )
+
+
+def response_cases(question_counts: List[int], page_sizes: List[int]):
+    """(schema, label, object) triples covering every response schema"""
+    topic = make_topic()
+    question = make_question(topic.id, 0)
+    yield AnswerOption, "one option", question.options[0]
+    yield TopicRead, "one topic", topic
+    yield Question, "one question", question
+
+    for n in question_counts:
+        questions = [make_question(topic.id, idx) for idx in range(n)]
+        yield QuizComposition, f"{n} questions", {"topic": topic, "questions": questions}
+
+    for size in page_sizes:
+        questions = [make_question(topic.id, idx) for idx in range(size)]
+        yield Page[Question], f"page of {size}", {"items": questions, "next_cursor": "c" * 40}
+        yield Page[TopicRead], f"page of {size}", {"items": [make_topic(i) for i in range(size)], "next_cursor": None}
+
+    errors = [{"row": row, "errors": ["options.0.num: Input should be a valid integer"]} for row in range(1, 101)]
+    yield ImportRowError, "one row", errors[0]
+    yield ImportReport, "100 errors", {"inserted": 9900, "failed": 100, "errors": errors, "errors_truncated": False}
+
+
+def request_cases(question_counts: List[int]):
+    """(schema, label, JSON body) triples for request schemas"""
+    topic_id = str(uuid.uuid4())
+    yield QuestionCreate, "one question", json.dumps(question_body(topic_id, 0))
+    yield TopicCreate, "one topic", json.dumps({"name": "History", "description": "Questions about the past"})
+    yield TopicFilters, "list filters", json.dumps({"cursor": "c" * 40, "limit": 50})
+    yield QuestionFilters, "list filters", json.dumps({"topic_id": topic_id, "limit": 10, "randomize": True})
+    yield QuizCompositionFilters, "composition filters", json.dumps({"limit": 10, "randomize": True})
+    for n in question_counts:
+        # POST /questions/ also accepts a list
+        yield List[QuestionCreate], f"{n} questions", json.dumps([question_body(topic_id, idx) for idx in range(n)])
+
+
+def fastapi_encode(model, obj) -> bytes:
+    """What FastAPI 0.111 does for `response_model=model` and a returned object"""
+    field = create_response_field(name="response", type_=model)
+
+    async def run():
+        content = await serialize_response(field=field, response_content=obj, is_coroutine=True)
+        return JSONResponse(content).body
+
+    return asyncio.run(run())
+
+
+def time_per_call(func, min_seconds: float) -> float:
+    """Mean microseconds per call, repeating until `min_seconds` have elapsed"""
+    calls, start = 0, time.perf_counter()
+    while True:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / calls * 1e6
+
+
+def bench_default(model, obj, min_seconds: float) -> float:
+    field = create_response_field(name="response", type_=model)
+
+    async def loop():
+        calls, start = 0, time.perf_counter()
+        while True:
+            content = await serialize_response(field=field, response_content=obj, is_coroutine=True)
+            JSONResponse(content)
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_seconds:
+                return elapsed / calls * 1e6
+
+    return asyncio.run(loop())
+
+
+def main(args):
+    random.seed(args.seed)
+    encoder = "orjson" if orjson is not None else "json (orjson not installed)"
+    print(f"fast path encoder: {encoder}\n")
+
+    results = []
+    print(f"{'response schema':<24} {'case':<24} {'default us':>11} {'fast us':>10} {'speedup':>8} {'bytes':>9}")
+    for model, label, obj in response_cases(args.questions, args.page_sizes):
+        name = model.__name__
+        expected = json.loads(fastapi_encode(model, obj))
+        body = encode(dump(model, obj))
+        if json.loads(body) != expected:
+            raise SystemExit(f"Fast path output differs from FastAPI for {name} ({label})")
+
+        default_us = bench_default(model, obj, args.min_seconds)
+        fast_us = time_per_call(lambda: encode(dump(model, obj)), args.min_seconds)
+        results.append({
+            "kind": "response", "schema": name, "case": label,
+            "default_us": round(default_us, 2), "fast_us": round(fast_us, 2), "bytes": len(body),
+        })
+        print(f"{name:<24} {label:<24} {default_us:>11.1f} {fast_us:>10.1f} {default_us / fast_us:>7.1f}x {len(body):>9}")
+
+    print(f"\n{'request schema':<24} {'case':<24} {'parse us':>11}")
+    for model, label, body in request_cases(args.questions):
+        name = model.__name__ if isinstance(model, type) else "List[QuestionCreate]"
+        adapter = TypeAdapter(model)
+        parse_us = time_per_call(lambda: adapter.validate_json(body), args.min_seconds)
+        results.append({"kind": "request", "schema": name, "case": label, "parse_us": round(parse_us, 2)})
+        print(f"{name:<24} {label:<24} {parse_us:>11.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"encoder": encoder, "results": results}, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="Time spent on each measurement")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write results as JSON (to compare releases)")
+    main(parser.parse_args())
@@ -0,0 +1,120 @@
+import os
+from typing import Any, AsyncIterable, List, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert, select, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.question import Question as QuestionORM, Topic as TopicORM
+from schemas.question import QuestionCreate
+from utils.jsonstream import InvalidItem
+
+# Rows validated and inserted per statement / transaction
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+# Row errors listed in the report (the rest are only counted)
+MAX_REPORTED_ERRORS = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", "100"))
+
+
+class QuestionImporter:
+    """
+    Validate and insert a stream of question items chunk by chunk.
+
+    Items may reference their topic by `topic_id` or by topic name under
+    `topic` (the layout of questions.json). Each chunk is validated,
+    inserted with a single INSERT ... RETURNING and committed, so memory use
+    is bounded by the chunk size and a failure only loses the current chunk.
+    """
+
+    def __init__(self, session: AsyncSession, chunk_size: int = IMPORT_CHUNK_SIZE):
+        self.session = session
+        self.chunk_size = chunk_size
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+        self._topic_ids: set = set()
+        self._topic_ids_by_name: dict = {}
+
+    def _fail(self, row: int, messages: List[str]):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": messages})
+
+    async def _resolve_topics(self, items: List[Tuple[int, Any]]):
+        """
+        Look up topics referenced in the chunk that are not cached yet (one query).
+
+        Only string references are looked up; any other value is left for
+        the row validation to report as that row's error.
+        """
+        ids, names = set(), set()
+        for _, item in items:
+            if "topic_id" in item:
+                topic_id = item["topic_id"]
+                if isinstance(topic_id, str) and topic_id not in self._topic_ids:
+                    ids.add(topic_id)
+            elif isinstance(item.get("topic"), str) and item["topic"] not in self._topic_ids_by_name:
+                names.add(item["topic"])
+        if not ids and not names:
+            return
+
+        result = await self.session.execute(
+            select(TopicORM.id, TopicORM.name).where(
+                or_(TopicORM.id.in_(ids), TopicORM.name.in_(names))
+            )
+        )
+        for topic_id, name in result.all():
+            self._topic_ids.add(topic_id)
+            self._topic_ids_by_name[name] = topic_id
+
+    async def _flush(self, items: List[Tuple[int, Any]]):
+        await self._resolve_topics(items)
+
+        rows = []
+        for row, item in items:
+            if "topic_id" not in item and "topic" in item:
+                if not isinstance(item["topic"], str):
+                    self._fail(row, ["topic: Input should be a valid string"])
+                    continue
+                topic_id = self._topic_ids_by_name.get(item["topic"])
+                if topic_id is None:
+                    self._fail(row, [f"Unknown topic name: {item['topic']}"])
+                    continue
+                item = {**item, "topic_id": topic_id}
+            try:
+                question = QuestionCreate.model_validate(item)
+            except ValidationError as e:
+                self._fail(row, [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()])
+                continue
+            if question.topic_id not in self._topic_ids:
+                self._fail(row, [f"Unknown topic_id: {question.topic_id}"])
+                continue
+            rows.append(question.model_dump())
+
+        if rows:
+            result = await self.session.execute(insert(QuestionORM).returning(QuestionORM.id), rows)
+            self.inserted += len(result.all())
+            await self.session.commit()
+
+    async def run(self, items: AsyncIterable[Any]) -> dict:
+        """Import every item and return the report"""
+        chunk: List[Tuple[int, Any]] = []
+        row = 0
+        async for item in items:
+            row += 1
+            if isinstance(item, InvalidItem):
+                self._fail(row, [item.message])
+                continue
+            if not isinstance(item, dict):
+                self._fail(row, ["Item is not a JSON object"])
+                continue
+            chunk.append((row, item))
+            if len(chunk) >= self.chunk_size:
+                await self._flush(chunk)
+                chunk = []
+        if chunk:
+            await self._flush(chunk)
+
+        return {
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
@@ -0,0 +1,48 @@
+import random
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.question import Question as QuestionORM
+
+
+async def sample_questions(
+    session: AsyncSession,
+    topic_id: Optional[str],
+    limit: int,
+) -> List[QuestionORM]:
+    """
+    Return up to `limit` random questions, optionally from one topic.
+
+    Every question carries a precomputed `random_key` in [0, 1). We draw a
+    random pivot and read the next `limit` rows in key order from the
+    (topic_id, random_key) index, wrapping around to the start of the range
+    when the pivot lands near the end. Cost depends on `limit`, not on the
+    size of the topic, unlike ORDER BY random() which sorts every row.
+
+    Rows are shuffled before returning so the order inside a sample is not
+    the index order.
+    """
+    base = select(QuestionORM)
+    if topic_id:
+        base = base.where(QuestionORM.topic_id == topic_id)
+
+    pivot = random.random()
+
+    result = await session.execute(
+        base.where(QuestionORM.random_key >= pivot)
+        .order_by(QuestionORM.random_key)
+        .limit(limit)
+    )
+    questions = list(result.scalars().all())
+
+    # Wrap around: take the remainder from the beginning of the key range
+    if len(questions) < limit:
+        result = await session.execute(
+            base.where(QuestionORM.random_key < pivot)
+            .order_by(QuestionORM.random_key)
+            .limit(limit - len(questions))
+        )
+        questions.extend(result.scalars().all())
+
+    random.shuffle(questions)
+    return questions
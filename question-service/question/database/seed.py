@@ -1,25 +1,26 @@
+import uuid
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 from models.question import Topic as TopicORM
 
+DEFAULT_TOPICS = ["General", "History", "Pets"]
+
 
 async def seed_topics(session: AsyncSession):
     """
     Seed the database with default topics.
 
     This function is idempotent - it can be run multiple times
-    without creating duplicate topics.
+    without creating duplicate topics. All topics are written with a single
+    INSERT ... ON CONFLICT (name) DO NOTHING, so replicas starting together
+    do not race or issue one lookup per topic.
     """
-    default_topics = ["General", "History", "Pets"]
-
-    for name in default_topics:
-        # Check if topic already exists
-        existing = await session.execute(
-            select(TopicORM).where(TopicORM.name == name)
-        )
-        if existing.scalar_one_or_none() is None:
-            # Topic doesn't exist, create it
-            session.add(TopicORM(name=name))
-
+    stmt = (
+        pg_insert(TopicORM)
+        .values([{"id": str(uuid.uuid4()), "name": name} for name in DEFAULT_TOPICS])
+        .on_conflict_do_nothing(index_elements=[TopicORM.name])
+        .returning(TopicORM.id)
+    )
+    created = len((await session.execute(stmt)).all())
     await session.commit()
-    print(f"✅ Seeded {len(default_topics)} default topics")
+    print(f"✅ Seeded {created} of {len(DEFAULT_TOPICS)} default topics")
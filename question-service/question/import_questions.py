@@ -0,0 +1,47 @@
+"""
+Bulk import questions from a JSON or NDJSON file.
+
+    python import_questions.py ../questions.json
+    python import_questions.py bank.ndjson --chunk-size 2000
+
+The file is read in small chunks and inserted chunk by chunk, so memory use
+does not depend on the file size.
+"""
+import argparse
+import asyncio
+import json
+
+from database.question import AsyncSessionLocal, engine
+from database.importer import QuestionImporter, IMPORT_CHUNK_SIZE
+from utils.jsonstream import iter_json_items
+
+READ_SIZE = 64 * 1024
+
+
+async def read_file(path: str):
+    with open(path, "rb") as f:
+        while chunk := f.read(READ_SIZE):
+            yield chunk
+
+
+async def main(args):
+    ndjson = args.format == "ndjson" or (
+        args.format == "auto" and args.path.endswith((".ndjson", ".jsonl"))
+    )
+    try:
+        async with AsyncSessionLocal() as session:
+            importer = QuestionImporter(session, chunk_size=args.chunk_size)
+            report = await importer.run(iter_json_items(read_file(args.path), ndjson=ndjson))
+    finally:
+        await engine.dispose()
+
+    print(json.dumps(report, indent=2))
+    print(f"✅ Imported {report['inserted']} question(s), {report['failed']} failed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="JSON array, {\"questions\": ...} wrapper, or NDJSON file")
+    parser.add_argument("--format", choices=["auto", "json", "ndjson"], default="auto")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    asyncio.run(main(parser.parse_args()))
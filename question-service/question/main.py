@@ -1,4 +1,5 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, status, Request, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -6,17 +7,47 @@ from models.question import Question as QuestionORM, Topic as TopicORM
 from schemas.question import (
     QuestionCreate, Question as QuestionSchema,
     TopicCreate, TopicRead as TopicSchema,
-    QuestionFilters
+    QuestionFilters, QuizCompositionFilters, QuizComposition,
+    TopicFilters, Page, ImportReport
 )
-from database.question import get_async_session, init_db, AsyncSessionLocal
+from database.question import engine, replica_engine, get_async_session, get_read_session, init_db, AsyncSessionLocal
 from database.seed import seed_topics
+from database.sampling import sample_questions
+from database.pagination import paginate, build_page, InvalidCursorError
+from database.importer import QuestionImporter
+from utils.jsonstream import iter_json_items, JsonStreamError
+from utils.httpcache import make_etag, is_not_modified, not_modified, SHARED_REVALIDATE, NO_STORE
+from utils.serialization import respond
+from monitoring.metrics import MetricsMiddleware, metrics_response, monitor_event_loop, mark_worker_stopped
+from monitoring.sqlstats import SQLStatsMiddleware
+from monitoring.tracing import setup_tracing, shutdown_tracing, trace_queries, TracingMiddleware
+from contextlib import asynccontextmanager
 from typing import List, Union
 from datetime import datetime
+import asyncio
 
 # -----------------------------
 # FastAPI setup
 # -----------------------------
-app = FastAPI(title="Quiz Service - Questions API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Check the database schema version and seed topics on startup; release resources on shutdown"""
+    await init_db()
+    print("✅ Database schema up to date")
+    async with AsyncSessionLocal() as session:
+        await seed_topics(session)
+    loop_monitor = asyncio.create_task(monitor_event_loop())
+    yield
+    # Shutdown (after in-flight requests have drained)
+    loop_monitor.cancel()
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+    shutdown_tracing()
+    mark_worker_stopped()
+
+app = FastAPI(title="Quiz Service - Questions API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -25,24 +56,76 @@ app.add_middleware(
     allow_methods=["*"],        # Allow all HTTP methods
     allow_headers=["*"],        # Allow all headers
 )
+app.add_middleware(SQLStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+# Outermost; continues the trace of quiz-service calls (TRACING_EXPORTER, off by default)
+if setup_tracing("question-service"):
+    app.add_middleware(TracingMiddleware)
+    trace_queries(engine)
+    if replica_engine is not None:
+        trace_queries(replica_engine)
 
-@app.on_event("startup")
-async def on_startup():
-    """Initialize database tables on application startup"""
-    await init_db()
-    print("✅ Database initialized")
-    async with AsyncSessionLocal() as session:
-        await seed_topics(session)
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    return JSONResponse(
+        status_code=400,
+        content={"detail": str(exc)}
+    )
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics: route latencies, in-flight requests and DB pool"""
+    return metrics_response()
 
 # -----------------------------
 # Topic CRUD Endpoints
 # -----------------------------
 
-# List all topics
-@app.get("/topics/", response_model=List[TopicSchema])
-async def get_topics(session: AsyncSession = Depends(get_async_session)):
-    result = await session.execute(select(TopicORM))
-    return result.scalars().all()
+# List topics, one page at a time ordered by name (unique)
+@app.get("/topics/", response_model=Page[TopicSchema])
+async def get_topics(
+    request: Request,
+    response: Response,
+    filters: TopicFilters = Depends(),
+    session: AsyncSession = Depends(get_read_session)
+):
+    order = (TopicORM.name,)
+    result = await session.execute(paginate(select(TopicORM), order, filters.cursor, filters.limit))
+    topics, next_cursor = build_page(result.scalars().all(), order, filters.limit)
+
+    # Topics have no timestamps: the ETag covers the page rows (skips serialization and transfer)
+    etag = make_etag(next_cursor, *((t.id, t.name, t.description) for t in topics))
+    if is_not_modified(request, etag):
+        return not_modified(etag, SHARED_REVALIDATE)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = SHARED_REVALIDATE
+    return respond(Page[TopicSchema], {"items": topics, "next_cursor": next_cursor}, response)
+
+# Topic plus a question sample for quiz-service (one request, one DB session)
+@app.get("/topics/{topic_id}/quiz-composition", response_model=QuizComposition)
+async def get_quiz_composition(
+    topic_id: str,
+    response: Response,
+    filters: QuizCompositionFilters = Depends(),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Return the topic and a sampled set of its questions.
+
+    quiz-service needs both to create a quiz; serving them together saves a
+    network hop and a second DB transaction.
+    """
+    topic = await session.get(TopicORM, topic_id)
+    if topic is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Topic not found"
+        )
+
+    questions = await load_questions(session, topic_id, filters.limit, filters.randomize)
+    response.headers["Cache-Control"] = NO_STORE
+    return respond(QuizComposition, {"topic": topic, "questions": questions}, response)
 
 # Create topic
 @app.post("/topics/", response_model=TopicSchema)
@@ -97,38 +180,101 @@ async def create_question(
     new_qs = [QuestionORM(**question.dict()) for question in questions]
     session.add_all(new_qs)    
     await session.commit()
-    for new_q in new_qs:
-        await session.refresh(new_q)
+    # No refresh needed: ids and timestamps are Python-side defaults set at flush
     return new_qs
 
 
+# Bulk import questions from a streamed JSON array or NDJSON body
+@app.post("/questions/import", response_model=ImportReport, summary="Bulk Import Questions")
+async def import_questions(request: Request, session: AsyncSession = Depends(get_async_session)):
+    """
+    Stream a question bank into the database.
+
+    Send a JSON array (or `{"questions": {...}}` as in questions.json) with
+    `Content-Type: application/json`, or one question per line with
+    `Content-Type: application/x-ndjson`. The body is parsed incrementally and
+    inserted in chunks; invalid rows are reported and skipped.
+    """
+    ndjson = "ndjson" in request.headers.get("content-type", "")
+    importer = QuestionImporter(session)
+    try:
+        return await importer.run(iter_json_items(request.stream(), ndjson=ndjson))
+    except JsonStreamError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": str(e), "inserted": importer.inserted}
+        )
+
+
+async def load_questions(session: AsyncSession, topic_id: str | None, limit: int, randomize: bool):
+    """Load the question set for the quiz-composition endpoint"""
+    if randomize:
+        return await sample_questions(session, topic_id, limit)
+
+    query = select(QuestionORM)
+    if topic_id:
+        query = query.where(QuestionORM.topic_id == topic_id)
+    result = await session.execute(query.order_by(QuestionORM.created_at, QuestionORM.id).limit(limit))
+    return result.scalars().all()
+
+
 # List questions with filters
-@app.get("/questions/", response_model=List[QuestionSchema])
-async def get_questions(filters: QuestionFilters = Depends(), session: AsyncSession = Depends(get_async_session)):
+@app.get("/questions/", response_model=Page[QuestionSchema])
+async def get_questions(filters: QuestionFilters = Depends(), session: AsyncSession = Depends(get_read_session)):
+    """
+    List questions one page at a time, ordered by (created_at, id).
+
+    With randomize=true a single random sample is returned and there is no
+    next page.
+    """
+    if filters.randomize:
+        questions = await sample_questions(session, filters.topic_id, filters.limit)
+        return respond(Page[QuestionSchema], {"items": questions, "next_cursor": None})
+
     query = select(QuestionORM)
     if filters.topic_id:
         query = query.where(QuestionORM.topic_id == filters.topic_id)
-    if filters.randomize:
-        query = query.order_by(func.random())
-    query = query.limit(filters.limit)
-    result = await session.execute(query)
-    return result.scalars().all()
+
+    order = (QuestionORM.created_at, QuestionORM.id)
+    result = await session.execute(paginate(query, order, filters.cursor, filters.limit))
+    questions, next_cursor = build_page(result.scalars().all(), order, filters.limit)
+    return respond(Page[QuestionSchema], {"items": questions, "next_cursor": next_cursor})
 
 
 # Get question by ID (REFERENCE - unchanged from 3.1)
 @app.get("/questions/{question_id}", response_model=QuestionSchema)
 async def get_question(
     question_id: str,
+    request: Request,
+    response: Response,
     session: AsyncSession = Depends(get_async_session)
 ):
-    """Retrieve a single question by ID"""
+    """
+    Retrieve a single question by ID.
+
+    The ETag is derived from the question's last-modified timestamp. When the
+    client sends If-None-Match only that timestamp is read (primary key
+    lookup) and a match returns 304 without loading the row.
+    """
+    if request.headers.get("if-none-match"):
+        version = await session.scalar(
+            select(func.coalesce(QuestionORM.updated_at, QuestionORM.created_at))
+            .where(QuestionORM.id == question_id)
+        )
+        etag = make_etag(question_id, version)
+        if version is not None and is_not_modified(request, etag):
+            return not_modified(etag, SHARED_REVALIDATE)
+
     q = await session.get(QuestionORM, question_id)
     if not q:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Question not found"
         )
-    return q
+
+    response.headers["ETag"] = make_etag(q.id, q.updated_at or q.created_at)
+    response.headers["Cache-Control"] = SHARED_REVALIDATE
+    return respond(QuestionSchema, q, response)
 
 
 # Update question (REFERENCE - unchanged from 3.1)
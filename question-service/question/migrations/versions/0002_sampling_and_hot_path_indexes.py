@@ -0,0 +1,60 @@
+"""random_key sampling column and hot path indexes
+
+- questions.random_key, backfilled with random(), for index-range sampling
+- questions (topic_id, random_key) / (random_key): random samples
+- questions (topic_id, created_at, id): topic filter in keyset order; its
+  leading column also serves plain topic_id lookups
+- questions (created_at, id): unfiltered keyset pagination
+
+Indexes are built CONCURRENTLY so upgrading a live database does not block
+writes.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 09:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "questions",
+        sa.Column("random_key", sa.Float(), nullable=False, server_default=sa.text("random()")),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_questions_topic_random_key", "questions", ["topic_id", "random_key"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_questions_random_key", "questions", ["random_key"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_questions_topic_created_at_id", "questions", ["topic_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_questions_created_at_id", "questions", ["created_at", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_questions_created_at_id", table_name="questions", postgresql_concurrently=True)
+        op.drop_index("ix_questions_topic_created_at_id", table_name="questions", postgresql_concurrently=True)
+        op.drop_index("ix_questions_random_key", table_name="questions", postgresql_concurrently=True)
+        op.drop_index("ix_questions_topic_random_key", table_name="questions", postgresql_concurrently=True)
+    op.drop_column("questions", "random_key")
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, Text, DateTime, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
+import random
 import uuid
 
 Base = declarative_base()
@@ -28,3 +29,14 @@ class Question(Base):
 
     topic_id = Column(String, ForeignKey("topics.id", ondelete="CASCADE"), nullable=False)
     topic = relationship("Topic", back_populates="questions")
+
+    # Random sort key, assigned once on insert. Sampling reads an index range
+    # starting at a random pivot instead of sorting the whole topic.
+    random_key = Column(Float, nullable=False, default=random.random, server_default=text("random()"))
+
+    __table_args__ = (
+        Index("ix_questions_topic_random_key", "topic_id", "random_key"),
+        Index("ix_questions_random_key", "random_key"),
+        Index("ix_questions_created_at_id", "created_at", "id"),
+        Index("ix_questions_topic_created_at_id", "topic_id", "created_at", "id"),
+    )
@@ -0,0 +1,143 @@
+import asyncio
+import os
+import time
+from fastapi import Response
+from prometheus_client import (
+    Counter, Gauge, Histogram, CollectorRegistry, CONTENT_TYPE_LATEST, REGISTRY, generate_latest, multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+
+# HTTP server
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency by route template",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter("http_requests_total", "Requests by route template and status", ["method", "route", "status"])
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "Requests being handled", ["method"], multiprocess_mode="livesum",
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "Delay of a periodic event loop callback beyond its schedule", buckets=WAIT_BUCKETS,
+)
+
+# SQLAlchemy connection pool
+DB_POOL_SIZE = Gauge("db_pool_size", "Configured pool size", ["pool"], multiprocess_mode="livesum")
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Connections in use", ["pool"], multiprocess_mode="livesum")
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond pool_size (negative while below it)", ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time to get a connection from the pool (includes connecting)",
+    ["pool"], buckets=WAIT_BUCKETS,
+)
+DB_POOL_TIMEOUTS = Counter("db_pool_checkout_timeouts_total", "Checkouts that hit pool_timeout", ["pool"])
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Async queue pool that records how long each checkout waits"""
+
+    metrics_name = "default"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.labels(self.metrics_name).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.metrics_name).observe(time.perf_counter() - start)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name
+        return pool
+
+
+def instrument_engine(engine: AsyncEngine, name: str):
+    """Label the engine's pool and keep its gauges current on every checkout / checkin"""
+    pool = engine.sync_engine.pool
+    pool.metrics_name = name
+
+    def update(*_):
+        current = engine.sync_engine.pool
+        if isinstance(current, AsyncAdaptedQueuePool):
+            DB_POOL_SIZE.labels(name).set(current.size())
+            DB_POOL_CHECKED_OUT.labels(name).set(current.checkedout())
+            DB_POOL_OVERFLOW.labels(name).set(current.overflow())
+
+    for event_name in ("connect", "checkout", "checkin", "close"):
+        event.listen(engine.sync_engine, event_name, update)
+    update()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status and concurrency per route.
+
+    Routes are labelled by their template (`/sessions/{session_id}`), read
+    from the matched route after the app has run, so label cardinality stays
+    bounded. Requests that match no route share the "unmatched" label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            route = scope.get("route")
+            template = getattr(route, "path", "unmatched")
+            REQUEST_LATENCY.labels(method, template).observe(time.perf_counter() - start)
+            REQUESTS.labels(method, template, str(status)).inc()
+
+
+async def monitor_event_loop(interval: float = 0.5):
+    """Sample event loop lag: how late a sleep of `interval` seconds wakes up"""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - start - interval))
+
+
+# Set by serve.py when running several workers: each writes its own files, /metrics merges them
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+
+def metrics_response() -> Response:
+    registry = REGISTRY
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_worker_stopped():
+    """Drop this worker's live gauges from the aggregate (multiprocess mode)"""
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
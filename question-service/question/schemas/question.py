@@ -1,8 +1,15 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional
+from typing import List, Optional, Generic, TypeVar
 from datetime import datetime
 import uuid
 
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    """One page of a keyset-paginated list"""
+    items: List[T]
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page; null on the last page")
+
 class AnswerOption(BaseModel):
     num: int
     text: str
@@ -40,9 +47,36 @@ class TopicRead(TopicBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class TopicFilters(BaseModel):
+    """Query parameters for paging through topics"""
+    cursor: Optional[str] = None
+    limit: int = Field(50, ge=1, le=200)
+
 # NEW: Query filters
 class QuestionFilters(BaseModel):
     """Query parameters for filtering questions"""
     topic_id: Optional[str] = None
     limit: int = Field(10, ge=1, le=100)
     randomize: bool = False
+    cursor: Optional[str] = Field(None, description="Ignored when randomize is true")
+
+class QuizCompositionFilters(BaseModel):
+    """Query parameters for composing a quiz from one topic"""
+    limit: int = Field(10, ge=1, le=100)
+    randomize: bool = True
+
+class QuizComposition(BaseModel):
+    """Topic plus a filtered question sample, returned in a single response"""
+    topic: TopicRead
+    questions: List[Question]
+
+class ImportRowError(BaseModel):
+    row: int  # 1-based position of the item in the uploaded stream
+    errors: List[str]
+
+class ImportReport(BaseModel):
+    """Result of a bulk question import"""
+    inserted: int
+    failed: int
+    errors: List[ImportRowError]
+    errors_truncated: bool = False
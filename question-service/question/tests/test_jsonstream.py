@@ -0,0 +1,53 @@
+"""
+Streaming JSON reader used by the question import.
+
+    cd question-service/question && python -m pytest tests
+"""
+import asyncio
+import json
+
+import pytest
+
+from utils.jsonstream import JsonStreamError, iter_json_items
+
+ITEMS = [
+    {"question": "Café?", "options": ["aé", "b"], "correct_option": 1, "weight": 1.5e3},
+    {"question": "Sign?", "options": ["-1", "1"], "correct_option": -1, "weight": -0.25E-2},
+]
+
+
+def collect(chunks, ndjson=False):
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    async def scenario():
+        return [item async for item in iter_json_items(stream(), ndjson=ndjson)]
+
+    return asyncio.run(scenario())
+
+
+def splits(data: bytes):
+    """The stream cut in two at every byte, then one byte per chunk"""
+    for cut in range(len(data) + 1):
+        yield [data[:cut], data[cut:]]
+    yield [data[i:i + 1] for i in range(len(data))]
+
+
+@pytest.mark.parametrize("layout", ["array", "object"])
+def test_numbers_survive_every_chunk_split(layout):
+    document = ITEMS if layout == "array" else {"questions": {str(i): item for i, item in enumerate(ITEMS)}}
+    data = json.dumps(document, ensure_ascii=False).encode()
+    for chunks in splits(data):
+        assert collect(chunks) == ITEMS, chunks
+
+
+def test_bare_numbers_split_inside_exponent():
+    data = b'["a\\u00e9", 1.5e3, -1, 2E+10]'
+    for chunks in splits(data):
+        assert collect(chunks) == ["aé", 1500.0, -1, 2e10], chunks
+
+
+def test_invalid_number_is_still_rejected():
+    with pytest.raises(JsonStreamError):
+        collect([b"[1.", b",2]"])
@@ -0,0 +1,31 @@
+import hashlib
+from typing import Any
+from fastapi import Request, Response
+
+# Cache-Control values
+# Rarely changing shared resources: clients keep a copy but revalidate (cheap 304)
+SHARED_REVALIDATE = "public, no-cache"
+# Random samples must never be replayed from a cache
+NO_STORE = "no-store"
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag from the values that determine a representation"""
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """True if the client's If-None-Match already names this representation"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 13.1.2): ignore W/ prefixes
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
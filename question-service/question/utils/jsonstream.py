@@ -0,0 +1,167 @@
+import codecs
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Optional
+
+# Largest single item (or NDJSON line) we are willing to buffer
+MAX_ITEM_CHARS = 1 << 20
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# What may still follow a number split at the end of a chunk
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+_decoder = json.JSONDecoder()
+
+
+class JsonStreamError(ValueError):
+    """Raised when the stream is not valid JSON / NDJSON and cannot be resumed."""
+
+
+class InvalidItem:
+    """Yielded in place of an NDJSON line that is not valid JSON."""
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+class _Reader:
+    """Text buffer over an async byte stream that only keeps unconsumed data."""
+
+    def __init__(self, chunks: AsyncIterable[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self) -> bool:
+        """Append the next chunk to the buffer; False once the stream is exhausted"""
+        if self.eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self.eof = True
+            chunk, final = b"", True
+        else:
+            final = False
+        self.text = self.text[self.pos:] + self._utf8.decode(chunk, final=final)
+        self.pos = 0
+        return not self.eof
+
+    async def peek(self) -> Optional[str]:
+        """Skip whitespace and return the next character without consuming it"""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not await self.fill():
+                return None
+
+    async def expect(self, char: str):
+        found = await self.peek()
+        if found != char:
+            raise JsonStreamError(f"Expected '{char}', found {found!r}")
+        self.pos += 1
+
+    async def value(self) -> Any:
+        """Decode the next complete JSON value, reading more data as needed"""
+        await self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise JsonStreamError(f"Invalid JSON: {e.msg}") from e
+                if len(self.text) - self.pos > MAX_ITEM_CHARS:
+                    raise JsonStreamError(f"Item larger than {MAX_ITEM_CHARS} characters") from e
+                await self.fill()
+                continue
+            # A number may continue in the next chunk: "1." or "1e" decode as 1 and
+            # leave the rest, so refill while only number characters follow it
+            if (
+                not self.eof
+                and isinstance(obj, (int, float))
+                and not isinstance(obj, bool)
+                and _NUMBER_TAIL.fullmatch(self.text, end)
+            ):
+                await self.fill()
+                continue
+            self.pos = end
+            return obj
+
+    async def line(self) -> Optional[str]:
+        """Return the next line (without the newline); None at end of stream"""
+        while True:
+            newline = self.text.find("\n", self.pos)
+            if newline != -1:
+                line = self.text[self.pos:newline]
+                self.pos = newline + 1
+                return line
+            if len(self.text) - self.pos > MAX_ITEM_CHARS:
+                raise JsonStreamError(f"Line longer than {MAX_ITEM_CHARS} characters")
+            if not await self.fill():
+                line = self.text[self.pos:]
+                self.pos = len(self.text)
+                return line or None
+
+
+async def _iter_container(reader: _Reader) -> AsyncIterator[Any]:
+    """Yield the values of the array or object starting at the reader position"""
+    opening = await reader.peek()
+    closing = {"[": "]", "{": "}"}.get(opening)
+    if closing is None:
+        raise JsonStreamError(f"Expected an array or object, found {opening!r}")
+    reader.pos += 1
+
+    first = True
+    while True:
+        char = await reader.peek()
+        if char == closing:
+            reader.pos += 1
+            return
+        if not first:
+            await reader.expect(",")
+        first = False
+        if closing == "}":
+            await reader.value()  # key, e.g. "1" in {"questions": {"1": {...}}}
+            await reader.expect(":")
+        yield await reader.value()
+
+
+async def iter_json_items(chunks: AsyncIterable[bytes], ndjson: bool = False) -> AsyncIterator[Any]:
+    """
+    Yield items from a JSON or NDJSON byte stream without loading it whole.
+
+    Accepted layouts:
+    - NDJSON (`ndjson=True`): one JSON value per line. A line that does not
+      parse is yielded as `InvalidItem` and reading continues.
+    - a JSON array: `[item, item, ...]`
+    - a JSON object whose first member holds the items, as an array or as an
+      object of keyed items: `{"questions": {"1": item, ...}}`. Members after
+      the first one are ignored.
+
+    Only the current item is buffered, so memory does not grow with the size
+    of the stream.
+    """
+    reader = _Reader(chunks)
+
+    if ndjson:
+        while (line := await reader.line()) is not None:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                yield InvalidItem(f"Invalid JSON: {e.msg}")
+        return
+
+    char = await reader.peek()
+    if char == "{":
+        reader.pos += 1
+        await reader.value()  # wrapper key, e.g. "questions"
+        await reader.expect(":")
+    elif char is None:
+        return
+
+    async for item in _iter_container(reader):
+        yield item
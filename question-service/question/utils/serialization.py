@@ -0,0 +1,112 @@
+import json
+import os
+from collections.abc import Mapping
+from datetime import date, datetime
+from typing import Any, Optional, Type, Union, get_args, get_origin
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+try:
+    import orjson  # optional dependency, the stdlib encoder is used without it
+except ImportError:
+    orjson = None
+
+# Opt-in: build responses straight from trusted ORM rows / snapshots, skipping
+# response_model validation, and encode them with orjson
+FAST_JSON = os.getenv("FAST_JSON", "0").lower() in ("1", "true", "yes")
+
+_MISSING = object()
+# model class -> tuple of (field name, default, nested model, is_list)
+_plans: dict = {}
+
+
+def _nested_model(annotation: Any) -> tuple:
+    """(model, is_list) for `Model`, `List[Model]` and `Optional[...]` of those; (None, False) otherwise"""
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _nested_model(args[0]) if len(args) == 1 else (None, False)
+    if origin in (list, tuple):
+        model, _ = _nested_model(get_args(annotation)[0])
+        return model, model is not None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+def _plan(model: Type[BaseModel]) -> tuple:
+    plan = _plans.get(model)
+    if plan is None:
+        plan = tuple(
+            (
+                name,
+                _MISSING if field.default is PydanticUndefined else field.default,
+                *_nested_model(field.annotation),
+            )
+            for name, field in model.model_fields.items()
+        )
+        _plans[model] = plan
+    return plan
+
+
+def dump(model: Type[BaseModel], obj: Any) -> dict:
+    """
+    Build the response dict of `model` from an object or mapping without validating it.
+
+    Only the fields declared on the model are copied (so hidden attributes
+    such as correct_option never leak) and nested models are followed. Only
+    use it for data the service produced itself: ORM rows, result mappings
+    and cached snapshots.
+    """
+    if isinstance(obj, Mapping):
+        get = obj.get
+    else:
+        get = lambda name, default: getattr(obj, name, default)
+
+    data = {}
+    for name, default, nested, is_list in _plan(model):
+        value = get(name, default)
+        if value is _MISSING:
+            raise AttributeError(f"{type(obj).__name__} has no field {name!r} required by {model.__name__}")
+        if nested is not None and value is not None:
+            value = [dump(nested, item) for item in value] if is_list else dump(nested, value)
+        data[name] = value
+    return data
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, tuple):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with orjson when installed"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return encode(content)
+
+
+def respond(model: Optional[Type[BaseModel]], obj: Any, response: Optional[Response] = None) -> Any:
+    """
+    Return `obj` for FastAPI to validate against the route's response_model,
+    or, with FAST_JSON on, an already encoded response built by `dump`.
+
+    Pass `model=None` when `obj` is already JSON-ready (e.g. a cached page).
+    Headers set on the injected `response` are carried over, since FastAPI
+    does not merge them into a returned Response.
+    """
+    if not FAST_JSON:
+        return obj
+    content = obj if model is None else dump(model, obj)
+    return FastJSONResponse(content, headers=dict(response.headers) if response is not None else None)
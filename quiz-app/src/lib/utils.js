@@ -17,17 +17,28 @@ async function getErrorMessage(res, defaultMessage) {
 
 /**
  * Fetch quizzes and extract unique topics from them
+ * Follows `next_cursor` until every page of the quiz list has been loaded.
  * @returns {Promise<{quizzes: Array, topics: Array}>}
  */
 export async function fetchQuizzesData() {
-  const quizzesRes = await fetch(`${API_QUIZ_BASE}/quizzes/`);
+  const quizzes = [];
+  let cursor = null;
 
-  if (!quizzesRes.ok) {
-    const errorMsg = await getErrorMessage(quizzesRes, 'Failed to fetch quizzes');
-    throw new Error(errorMsg);
-  }
+  do {
+    const params = new URLSearchParams({ limit: '200' });
+    if (cursor) params.set('cursor', cursor);
+
+    const quizzesRes = await fetch(`${API_QUIZ_BASE}/quizzes/?${params}`);
+
+    if (!quizzesRes.ok) {
+      const errorMsg = await getErrorMessage(quizzesRes, 'Failed to fetch quizzes');
+      throw new Error(errorMsg);
+    }
 
-  const quizzes = await quizzesRes.json();
+    const page = await quizzesRes.json();
+    quizzes.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
 
   // Extract unique topics from quizzes
   const topicMap = new Map();
@@ -0,0 +1,223 @@
+"""
+Benchmark response serialization for every schema in schema/quizschema.py.
+
+For each response schema the default FastAPI path (validate the ORM object
+or snapshot against the response_model, dump it to JSON-compatible data and
+encode it with the stdlib encoder) is compared with the FAST_JSON path in
+utils/serialization.py (copy declared fields straight from the object, encode
+with orjson). Both outputs are decoded and compared, so the benchmark also
+checks that the fast path returns the same document. Request schemas are
+timed for parsing a JSON body.
+
+Needs no database: objects are built in memory at realistic sizes.
+
+    python benchmarks/bench_serialization.py --questions 10 100 --page-sizes 50 200 \
+        --output serialization.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "quiz"))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from models.quizmodel import (
+    Quiz as QuizORM, QuizQuestion as QuizQuestionORM, QuizSession as QuizSessionORM, Answer as AnswerORM,
+)
+from cache.snapshots import QuizSnapshot
+from schema.quizschema import (
+    Page, Quiz, QuizDetails, QuizQuestion, QuestionForClient, AnswerOption, QuizSession, QuizSessionDetails,
+    Answer, QuizSessionBootstrap, QuizSessionSummary, QuestionResultDetail, DetailedQuizResults,
+    QuizRequest, QuizFilter, QuizSessionFilter, AnswerSubmitRequest, AnswerBatchRequest,
+)
+from utils.serialization import dump, encode, orjson
+
+NOW = datetime(2025, 12, 1, 12, 0, 0, 123456)
+
+
+def make_quiz(question_count: int) -> QuizORM:
+    quiz = QuizORM(
+        id=str(uuid.uuid4()), name="History recap", user_id="1", topic_id=str(uuid.uuid4()),
+        topic_name="History", question_count=question_count, passing_ratio=0.7,
+        time_limit_seconds=900, number_of_attempts=3, created_at=NOW, updated_at=None,
+    )
+    for idx in range(question_count):
+        quiz.questions.append(QuizQuestionORM(
+            id=str(uuid.uuid4()), quiz_id=quiz.id, question_id=str(uuid.uuid4()), name=f"q{idx}",
+            question=f"Which event happened in year {1800 + idx}? " * 2,
+            options=[{"num": n, "text": f"Option {n} for question {idx}"} for n in range(1, 5)],
+            correct_option=random.randint(1, 4), explanation="Because the history books say so. " * 3,
+            order_index=idx,
+        ))
+    return quiz
+
+
+def make_session(quiz: QuizORM, answered: int, active: bool = False) -> QuizSessionORM:
+    qsession = QuizSessionORM(
+        id=str(uuid.uuid4()), quiz_id=quiz.id, user_id="1", question_count=quiz.question_count,
+        time_limit_seconds=quiz.time_limit_seconds, attempt_number=1, question_progress_index=answered,
+        score=answered // 2, wrong_answers=answered - answered // 2,
+        unanswered_questions=quiz.question_count - answered, is_active=active, started_at=NOW,
+        completed_at=None if active else NOW + timedelta(minutes=7), completion_details=None if active else "completed",
+    )
+    qsession.quiz = quiz
+    for q in quiz.questions[:answered]:
+        qsession.answers.append(AnswerORM(
+            id=str(uuid.uuid4()), quiz_session_id=qsession.id, quiz_question_id=q.id,
+            selected_option=random.randint(1, 4), is_correct=None if active else random.random() < 0.5,
+            answered_at=NOW, updated_at=NOW, submitted_at=None if active else NOW,
+            graded_at=None if active else NOW, revision_count=0, attempt_number=1,
+        ))
+    return qsession
+
+
+def detailed_results(qsession: QuizSessionORM) -> dict:
+    answers = {a.quiz_question_id: a for a in qsession.answers}
+    return {
+        **{name: getattr(qsession, name) for name in QuizSessionSummary.model_fields},
+        "questions": [
+            {
+                "question_id": q.id,
+                "question_text": q.question,
+                "user_answer": answers[q.id].selected_option if q.id in answers else None,
+                "correct_answer": q.correct_option,
+                "is_correct": answers[q.id].is_correct if q.id in answers else None,
+                "is_answered": q.id in answers,
+            }
+            for q in qsession.quiz.questions
+        ],
+    }
+
+
+def response_cases(question_counts: List[int], page_sizes: List[int]):
+    """(schema, label, object) triples covering every response schema"""
+    for n in question_counts:
+        quiz = make_quiz(n)
+        snapshot = QuizSnapshot.from_orm(quiz)
+        finished = make_session(quiz, answered=n)
+        active = make_session(quiz, answered=n // 2, active=True)
+        label = f"{n} questions"
+        yield AnswerOption, label, quiz.questions[0].options[0]
+        yield QuizQuestion, label, quiz.questions[0]
+        yield QuestionForClient, f"{label}, snapshot", snapshot.questions[0]
+        yield Quiz, label, quiz
+        yield QuizDetails, f"{label}, snapshot", snapshot
+        yield QuizSession, label, finished
+        yield Answer, label, finished.answers[0]
+        yield QuizSessionDetails, label, finished
+        yield QuizSessionBootstrap, f"{label}, active", {
+            "session": active, "questions": snapshot.questions, "answers": active.answers,
+        }
+        yield QuizSessionSummary, label, finished
+        results = detailed_results(finished)
+        yield QuestionResultDetail, label, results["questions"][0]
+        yield DetailedQuizResults, label, results
+
+    for size in page_sizes:
+        quizzes = [make_quiz(0) for _ in range(size)]
+        yield Page[Quiz], f"page of {size}", {"items": quizzes, "next_cursor": "c" * 40}
+        yield Page[QuizSession], f"page of {size}", {
+            "items": [make_session(quiz, answered=0) for quiz in quizzes], "next_cursor": None,
+        }
+
+
+def request_cases(question_counts: List[int]):
+    """(schema, label, JSON body) triples for request schemas"""
+    yield QuizRequest, "create quiz", json.dumps({"name": "History recap", "topic_id": str(uuid.uuid4()), "limit": 10})
+    yield QuizFilter, "list filters", json.dumps({"user_id": "1", "topic_id": str(uuid.uuid4()), "limit": 50})
+    yield QuizSessionFilter, "list filters", json.dumps({"user_id": "1", "is_active": True, "limit": 50})
+    yield AnswerSubmitRequest, "one answer", json.dumps({"selected_option": 2})
+    for n in question_counts:
+        body = {"answers": [{"question_id": str(uuid.uuid4()), "selected_option": 2} for _ in range(n)]}
+        yield AnswerBatchRequest, f"{n} answers", json.dumps(body)
+
+
+def fastapi_encode(model, obj) -> bytes:
+    """What FastAPI 0.111 does for `response_model=model` and a returned object"""
+    field = create_response_field(name="response", type_=model)
+
+    async def run():
+        content = await serialize_response(field=field, response_content=obj, is_coroutine=True)
+        return JSONResponse(content).body
+
+    return asyncio.run(run())
+
+
+def time_per_call(func, min_seconds: float) -> float:
+    """Mean microseconds per call, repeating until `min_seconds` have elapsed"""
+    calls, start = 0, time.perf_counter()
+    while True:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / calls * 1e6
+
+
+def bench_default(model, obj, min_seconds: float) -> float:
+    field = create_response_field(name="response", type_=model)
+
+    async def loop():
+        calls, start = 0, time.perf_counter()
+        while True:
+            content = await serialize_response(field=field, response_content=obj, is_coroutine=True)
+            JSONResponse(content)
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_seconds:
+                return elapsed / calls * 1e6
+
+    return asyncio.run(loop())
+
+
+def main(args):
+    random.seed(args.seed)
+    encoder = "orjson" if orjson is not None else "json (orjson not installed)"
+    print(f"fast path encoder: {encoder}\n")
+
+    results = []
+    print(f"{'response schema':<24} {'case':<24} {'default us':>11} {'fast us':>10} {'speedup':>8} {'bytes':>9}")
+    for model, label, obj in response_cases(args.questions, args.page_sizes):
+        name = model.__name__
+        expected = json.loads(fastapi_encode(model, obj))
+        body = encode(dump(model, obj))
+        if json.loads(body) != expected:
+            raise SystemExit(f"Fast path output differs from FastAPI for {name} ({label})")
+
+        default_us = bench_default(model, obj, args.min_seconds)
+        fast_us = time_per_call(lambda: encode(dump(model, obj)), args.min_seconds)
+        results.append({
+            "kind": "response", "schema": name, "case": label,
+            "default_us": round(default_us, 2), "fast_us": round(fast_us, 2), "bytes": len(body),
+        })
+        print(f"{name:<24} {label:<24} {default_us:>11.1f} {fast_us:>10.1f} {default_us / fast_us:>7.1f}x {len(body):>9}")
+
+    print(f"\n{'request schema':<24} {'case':<24} {'parse us':>11}")
+    for model, label, body in request_cases(args.questions):
+        parse_us = time_per_call(lambda: model.model_validate_json(body), args.min_seconds)
+        results.append({"kind": "request", "schema": model.__name__, "case": label, "parse_us": round(parse_us, 2)})
+        print(f"{model.__name__:<24} {label:<24} {parse_us:>11.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"encoder": encoder, "results": results}, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--min-seconds", type=float, default=0.5, help="Time spent on each measurement")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Write results as JSON (to compare releases)")
+    main(parser.parse_args())
@@ -0,0 +1,144 @@
+import json
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# "memory" (per process) or "redis" (shared by all workers and replicas).
+# memory only suits a single process: other workers and replicas never see its
+# invalidations, so list caching is switched off when several workers run
+# (cache/policies.py). Use redis whenever more than one replica serves traffic.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "quiz-service:")
+MEMORY_CACHE_MAX_ENTRIES = int(os.getenv("MEMORY_CACHE_MAX_ENTRIES", "10000"))
+
+
+class CacheBackend(ABC):
+    """
+    Key/value cache for JSON-serializable values with per-key TTL.
+
+    Backends never raise on cache failures: a broken cache behaves like an
+    empty one so read endpoints fall back to the database.
+    """
+
+    # True when every worker and replica sees the same entries (and so each other's deletes)
+    shared = False
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: int): ...
+
+    @abstractmethod
+    async def delete(self, *keys: str): ...
+
+    @abstractmethod
+    async def incr(self, key: str) -> Optional[int]:
+        """Atomically increment an integer counter (used for versioned keys)"""
+
+    async def close(self):
+        pass
+
+
+class MemoryCache(CacheBackend):
+    """In-process backend: LRU-bounded dict with lazy expiry"""
+
+    def __init__(self, max_entries: int = MEMORY_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int):
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    async def incr(self, key: str) -> Optional[int]:
+        value = (await self.get(key) or 0) + 1
+        await self.set(key, value, ttl=0)
+        return value
+
+
+class RedisCache(CacheBackend):
+    """
+    Redis-protocol backend shared by all replicas.
+
+    Takes any `redis.asyncio.Redis`-compatible client, so tests can pass a
+    `fakeredis.aioredis.FakeRedis()` instead of a real server.
+    """
+
+    shared = True
+
+    def __init__(self, client, prefix: str = CACHE_KEY_PREFIX):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str = REDIS_URL) -> "RedisCache":
+        import redis.asyncio as redis  # optional dependency, only needed for this backend
+        return cls(redis.from_url(url))
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            payload = await self.client.get(self.prefix + key)
+        except Exception as e:
+            logger.warning("Cache get failed for %s: %s", key, e)
+            return None
+        return json.loads(payload) if payload is not None else None
+
+    async def set(self, key: str, value: Any, ttl: int):
+        try:
+            await self.client.set(self.prefix + key, json.dumps(value, default=str), ex=ttl or None)
+        except Exception as e:
+            logger.warning("Cache set failed for %s: %s", key, e)
+
+    async def delete(self, *keys: str):
+        if not keys:
+            return
+        try:
+            await self.client.delete(*(self.prefix + key for key in keys))
+        except Exception as e:
+            logger.warning("Cache delete failed for %s: %s", keys, e)
+
+    async def incr(self, key: str) -> Optional[int]:
+        try:
+            return await self.client.incr(self.prefix + key)
+        except Exception as e:
+            logger.warning("Cache incr failed for %s: %s", key, e)
+            return None
+
+    async def close(self):
+        await self.client.aclose()
+
+
+def create_cache() -> CacheBackend:
+    if CACHE_BACKEND == "redis":
+        return RedisCache.from_url(REDIS_URL)
+    if CACHE_BACKEND == "memory":
+        return MemoryCache()
+    raise ValueError(f"Unknown CACHE_BACKEND: {CACHE_BACKEND}")
+
+
+cache = create_cache()
@@ -0,0 +1,63 @@
+import hashlib
+import json
+import os
+from typing import Optional
+from cache.backends import cache, CACHE_BACKEND
+
+# TTL per cached read (seconds)
+QUIZ_SNAPSHOT_TTL = int(os.getenv("CACHE_TTL_QUIZ_SNAPSHOT", "3600"))  # GET /quizzes/{id}; immutable until deleted
+QUIZ_LIST_TTL = int(os.getenv("CACHE_TTL_QUIZ_LIST", "30"))            # GET /quizzes/ filter results
+SESSION_LIST_TTL = int(os.getenv("CACHE_TTL_SESSION_LIST", "10"))      # GET /sessions/ filter results
+
+# List results are cached under a version number; writes bump the version
+# instead of hunting down every filter combination. If a version counter is
+# lost (eviction, restart of the memory backend) entries are at worst stale
+# for one TTL.
+QUIZ_LIST_VERSION = "quizzes:version"
+SESSION_LIST_VERSION = "sessions:version"
+
+# The version counters must be seen by every process: with the memory backend
+# a bump in one worker is invisible to the others, so lists are then only
+# cached when this process is the only worker (WEB_CONCURRENCY is set by serve.py).
+# Several replicas need CACHE_BACKEND=redis.
+LIST_CACHE_ENABLED = CACHE_BACKEND != "memory" or int(os.getenv("WEB_CONCURRENCY", "1")) <= 1
+
+
+def _digest(params: dict) -> str:
+    raw = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def quiz_snapshot_key(quiz_id: str) -> str:
+    return f"quiz:{quiz_id}"
+
+
+async def quiz_list_key(params: dict) -> Optional[str]:
+    """Cache key of a quiz list page; None when lists must not be cached"""
+    if not LIST_CACHE_ENABLED:
+        return None
+    version = await cache.get(QUIZ_LIST_VERSION) or 0
+    return f"quizzes:v{version}:{_digest(params)}"
+
+
+async def session_list_key(params: dict) -> Optional[str]:
+    if not LIST_CACHE_ENABLED:
+        return None
+    # Lists filtered by user only go stale when that user's sessions change
+    user_id = params.get("user_id")
+    version_key = f"{SESSION_LIST_VERSION}:{user_id}" if user_id else SESSION_LIST_VERSION
+    version = await cache.get(version_key) or 0
+    return f"sessions:{user_id or '*'}:v{version}:{_digest(params)}"
+
+
+async def invalidate_quiz(quiz_id: Optional[str] = None):
+    """Drop a quiz's cached snapshot and every cached quiz list"""
+    if quiz_id:
+        await cache.delete(quiz_snapshot_key(quiz_id))
+    await cache.incr(QUIZ_LIST_VERSION)
+
+
+async def invalidate_session_lists(user_id: str):
+    """Drop cached session lists that may contain this user's sessions"""
+    await cache.incr(SESSION_LIST_VERSION)
+    await cache.incr(f"{SESSION_LIST_VERSION}:{user_id}")
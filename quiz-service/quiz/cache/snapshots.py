@@ -0,0 +1,251 @@
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from models.quizmodel import Quiz as QuizORM, QuizQuestion as QuizQuestionORM
+from cache.backends import cache
+from cache.policies import quiz_snapshot_key, QUIZ_SNAPSHOT_TTL
+
+# Size limits for the in-process quiz snapshot cache
+MAX_QUIZZES = int(os.getenv("QUIZ_CACHE_MAX_QUIZZES", "1000"))
+MAX_QUESTIONS = int(os.getenv("QUIZ_CACHE_MAX_QUESTIONS", "100000"))
+# Seconds an in-process snapshot is served before the quiz's existence is re-checked.
+# Deletes only clear the cache of the process that handled them, so this bounds how
+# long other workers / replicas keep serving a deleted quiz.
+REVALIDATE_SECONDS = float(os.getenv("QUIZ_CACHE_REVALIDATE_SECONDS", "30"))
+
+
+@dataclass(frozen=True)
+class CachedQuestion:
+    id: str
+    quiz_id: str
+    question_id: str
+    name: str
+    question: str
+    options: tuple
+    correct_option: int
+    explanation: str
+    order_index: int
+
+    @classmethod
+    def from_orm(cls, q: QuizQuestionORM) -> "CachedQuestion":
+        return cls(
+            id=q.id,
+            quiz_id=q.quiz_id,
+            question_id=q.question_id,
+            name=q.name,
+            question=q.question,
+            options=tuple(q.options or ()),
+            correct_option=q.correct_option,
+            explanation=q.explanation,
+            order_index=q.order_index,
+        )
+
+
+@dataclass(frozen=True)
+class QuizSnapshot:
+    """Immutable copy of a quiz and its ordered question set"""
+    id: str
+    name: str
+    user_id: str
+    topic_id: str
+    topic_name: str
+    question_count: int
+    passing_ratio: float
+    time_limit_seconds: Optional[int]
+    number_of_attempts: Optional[int]
+    created_at: datetime
+    updated_at: Optional[datetime]
+    questions: Tuple[CachedQuestion, ...]
+
+    @classmethod
+    def from_orm(cls, quiz: QuizORM) -> "QuizSnapshot":
+        questions = sorted(quiz.questions, key=lambda q: q.order_index)
+        return cls(
+            id=quiz.id,
+            name=quiz.name,
+            user_id=quiz.user_id,
+            topic_id=quiz.topic_id,
+            topic_name=quiz.topic_name,
+            question_count=quiz.question_count,
+            passing_ratio=quiz.passing_ratio,
+            time_limit_seconds=quiz.time_limit_seconds,
+            number_of_attempts=quiz.number_of_attempts,
+            created_at=quiz.created_at,
+            updated_at=quiz.updated_at,
+            questions=tuple(CachedQuestion.from_orm(q) for q in questions),
+        )
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["created_at"] = self.created_at.isoformat()
+        data["updated_at"] = self.updated_at.isoformat() if self.updated_at else None
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuizSnapshot":
+        return cls(**{
+            **data,
+            "created_at": datetime.fromisoformat(data["created_at"]),
+            "updated_at": datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else None,
+            "questions": tuple(
+                CachedQuestion(**{**q, "options": tuple(q["options"])}) for q in data["questions"]
+            ),
+        })
+
+    def question_at(self, order_index: int) -> Optional[CachedQuestion]:
+        # order_index is assigned 0..n-1 when the quiz is created
+        if 0 <= order_index < len(self.questions) and self.questions[order_index].order_index == order_index:
+            return self.questions[order_index]
+        return next((q for q in self.questions if q.order_index == order_index), None)
+
+    def question_by_id(self, question_id: str) -> Optional[CachedQuestion]:
+        return next((q for q in self.questions if q.id == question_id), None)
+
+
+class SnapshotCache:
+    """
+    Bounded LRU cache of quiz snapshots keyed by quiz_id.
+
+    Quiz questions are snapshotted when the quiz is created and never change
+    afterwards, so entries stay valid until the quiz is deleted. A delete in
+    another process is not seen here: entries older than `revalidate_after`
+    seconds are returned by `get_stale` instead of `get`, for the caller to
+    confirm the quiz still exists. Limits apply both to the number of
+    quizzes and to the total number of questions held.
+    """
+
+    def __init__(
+        self,
+        max_quizzes: int = MAX_QUIZZES,
+        max_questions: int = MAX_QUESTIONS,
+        revalidate_after: float = REVALIDATE_SECONDS,
+    ):
+        self.max_quizzes = max_quizzes
+        self.max_questions = max_questions
+        self.revalidate_after = revalidate_after
+        # quiz_id -> snapshot, and when the quiz was last known to exist
+        self._entries: "OrderedDict[str, QuizSnapshot]" = OrderedDict()
+        self._checked_at: dict = {}
+        self._quiz_by_question: dict = {}
+        self._question_total = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, quiz_id: str) -> Optional[QuizSnapshot]:
+        snapshot = self._entries.get(quiz_id)
+        if snapshot is None or time.monotonic() - self._checked_at[quiz_id] >= self.revalidate_after:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(quiz_id)
+        self.hits += 1
+        return snapshot
+
+    def get_stale(self, quiz_id: str) -> Optional[QuizSnapshot]:
+        """An entry `get` no longer serves; pass it to `revalidated` once the quiz is known to exist"""
+        return self._entries.get(quiz_id)
+
+    def revalidated(self, quiz_id: str):
+        if quiz_id in self._entries:
+            self._checked_at[quiz_id] = time.monotonic()
+            self._entries.move_to_end(quiz_id)
+
+    def quiz_id_for_question(self, question_id: str) -> Optional[str]:
+        return self._quiz_by_question.get(question_id)
+
+    def put(self, snapshot: QuizSnapshot):
+        if len(snapshot.questions) > self.max_questions:
+            return
+        self._remove(snapshot.id)
+        self._entries[snapshot.id] = snapshot
+        self._checked_at[snapshot.id] = time.monotonic()
+        self._question_total += len(snapshot.questions)
+        for q in snapshot.questions:
+            self._quiz_by_question[q.id] = snapshot.id
+
+        while len(self._entries) > self.max_quizzes or self._question_total > self.max_questions:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, quiz_id: str):
+        self._remove(quiz_id)
+
+    def _remove(self, quiz_id: str):
+        snapshot = self._entries.pop(quiz_id, None)
+        if snapshot is None:
+            return
+        del self._checked_at[quiz_id]
+        self._question_total -= len(snapshot.questions)
+        for q in snapshot.questions:
+            self._quiz_by_question.pop(q.id, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else None,
+            "evictions": self.evictions,
+            "quizzes": len(self._entries),
+            "questions": self._question_total,
+            "max_quizzes": self.max_quizzes,
+            "max_questions": self.max_questions,
+            "revalidate_after_seconds": self.revalidate_after,
+        }
+
+
+snapshot_cache = SnapshotCache()
+
+
+async def store_quiz_snapshot(snapshot: QuizSnapshot):
+    """Put a snapshot in the in-process cache and the shared cache"""
+    snapshot_cache.put(snapshot)
+    await cache.set(quiz_snapshot_key(snapshot.id), snapshot.to_dict(), ttl=QUIZ_SNAPSHOT_TTL)
+
+
+async def _quiz_exists(db: AsyncSession, quiz_id: str) -> bool:
+    return await db.scalar(select(QuizORM.id).where(QuizORM.id == quiz_id)) is not None
+
+
+async def get_quiz_snapshot(db: AsyncSession, quiz_id: str) -> Optional[QuizSnapshot]:
+    """
+    Return the quiz snapshot, looking in the in-process cache, then the
+    shared cache (other replicas may have loaded it), then the database.
+
+    Snapshots the database has not confirmed for a while (an expired
+    in-process entry, or any entry of a memory backend, which other
+    processes' deletes never reach) are only served after a primary-key
+    existence check, which is much cheaper than reloading the questions.
+    """
+    snapshot = snapshot_cache.get(quiz_id)
+    if snapshot is not None:
+        return snapshot
+
+    stale = snapshot_cache.get_stale(quiz_id)
+    if stale is not None:
+        if await _quiz_exists(db, quiz_id):
+            snapshot_cache.revalidated(quiz_id)
+            return stale
+        snapshot_cache.invalidate(quiz_id)
+        await cache.delete(quiz_snapshot_key(quiz_id))
+        return None
+
+    data = await cache.get(quiz_snapshot_key(quiz_id))
+    if data is not None and (cache.shared or await _quiz_exists(db, quiz_id)):
+        snapshot = QuizSnapshot.from_dict(data)
+        snapshot_cache.put(snapshot)
+        return snapshot
+
+    quiz = await db.get(QuizORM, quiz_id, options=(selectinload(QuizORM.questions),), populate_existing=True)
+    if quiz is None:
+        return None
+    snapshot = QuizSnapshot.from_orm(quiz)
+    await store_quiz_snapshot(snapshot)
+    return snapshot
@@ -0,0 +1,212 @@
+import asyncio
+import os
+import random
+import time
+from typing import Any, Optional
+
+import httpx
+from opentelemetry.trace import SpanKind
+from monitoring.metrics import QUESTION_SERVICE_LATENCY, QUESTION_SERVICE_ERRORS, QUESTION_SERVICE_RETRIES
+from monitoring.tracing import tracer, inject_headers
+
+# Connection settings for calls to question-service
+BASE_URL = os.getenv("QUESTION_SERVICE_BASE_URL", "http://question-service:8000")
+TIMEOUT_SECONDS = float(os.getenv("QUESTION_SERVICE_TIMEOUT", "10.0"))
+MAX_CONNECTIONS = int(os.getenv("QUESTION_SERVICE_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("QUESTION_SERVICE_MAX_KEEPALIVE", "20"))
+KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("QUESTION_SERVICE_KEEPALIVE_EXPIRY", "30.0"))
+
+# Retry policy (idempotent GETs only)
+MAX_RETRIES = int(os.getenv("QUESTION_SERVICE_MAX_RETRIES", "2"))
+BACKOFF_BASE_SECONDS = float(os.getenv("QUESTION_SERVICE_BACKOFF_BASE", "0.1"))
+BACKOFF_MAX_SECONDS = float(os.getenv("QUESTION_SERVICE_BACKOFF_MAX", "2.0"))
+
+# Circuit breaker policy
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("QUESTION_SERVICE_BREAKER_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("QUESTION_SERVICE_BREAKER_RESET", "30.0"))
+
+
+def _error_reason(error: httpx.TransportError) -> str:
+    if isinstance(error, httpx.TimeoutException):
+        return "timeout"
+    if isinstance(error, httpx.ConnectError):
+        return "connect"
+    return "transport"
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker rejects a call without trying it."""
+
+
+class CircuitBreaker:
+    """
+    Minimal closed / open / half-open circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and every
+    call fails fast. Once `reset_timeout` seconds have passed a single trial
+    call is let through (half-open): success closes the circuit, failure
+    opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow_request(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+        # Half-open: only one trial call at a time
+        if self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self._trial_in_flight = False
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def release_trial(self):
+        """End a half-open trial that produced no outcome (cancelled, unexpected error): the next call may try"""
+        self._trial_in_flight = False
+
+
+class QuestionServiceClient:
+    """
+    Long-lived HTTP client for question-service.
+
+    One instance is created at application startup and shared by all
+    requests, so TCP connections are kept alive and reused from the pool.
+    """
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        timeout: float = TIMEOUT_SECONDS,
+        max_retries: int = MAX_RETRIES,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.breaker = breaker or CircuitBreaker(BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self):
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+                ),
+            )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("QuestionServiceClient is not started")
+        return self._client
+
+    def _backoff(self, attempt: int) -> float:
+        # "Full jitter": sleep a random amount up to the exponential cap
+        cap = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    async def _get(self, path: str, params: Optional[dict], route: str) -> httpx.Response:
+        """One attempt, in a client span whose context is sent as traceparent"""
+        with tracer.start_as_current_span(
+            f"GET {route}",
+            kind=SpanKind.CLIENT,
+            attributes={"http.request.method": "GET", "server.address": self.base_url, "url.template": route},
+        ) as span:
+            response = await self.client.get(path, params=params, headers=inject_headers())
+            span.set_attribute("http.response.status_code", response.status_code)
+            return response
+
+    async def get_json(self, path: str, params: Optional[dict] = None, route: Optional[str] = None) -> Any:
+        """
+        GET `path` and return the decoded JSON body.
+
+        `route` is the path template used to label metrics (defaults to
+        `path`); pass it whenever `path` contains ids.
+
+        Transport errors and 5xx responses are retried with jittered
+        exponential backoff and count as breaker failures. 4xx responses are
+        raised immediately (the service is healthy, the request is not).
+
+        No conditional headers are sent: the only resource fetched,
+        quiz-composition, is a fresh random sample served as no-store.
+        """
+        route = route or path
+        if not self.breaker.allow_request():
+            QUESTION_SERVICE_ERRORS.labels(route, "circuit_open").inc()
+            raise CircuitOpenError(f"Circuit open for {self.base_url}")
+        # Admitted while half-open: this call is the single trial
+        trial = self.breaker.state == CircuitBreaker.HALF_OPEN
+        try:
+            return await self._get_json(path, params, route)
+        finally:
+            # Settled trials were already released by record_success / record_failure
+            if trial and self.breaker.state == CircuitBreaker.HALF_OPEN:
+                self.breaker.release_trial()
+
+    async def _get_json(self, path: str, params: Optional[dict], route: str) -> Any:
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = await self._get(path, params, route)
+                status = str(response.status_code)
+                QUESTION_SERVICE_LATENCY.labels(route, status).observe(time.perf_counter() - start)
+                if response.status_code >= 400:
+                    QUESTION_SERVICE_ERRORS.labels(route, f"http_{status}").inc()
+                if response.status_code < 500:
+                    self.breaker.record_success()
+                    response.raise_for_status()
+                    return response.json()
+                response.raise_for_status()
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code < 500 or attempt >= self.max_retries:
+                    if e.response.status_code >= 500:
+                        self.breaker.record_failure()
+                    raise
+            except httpx.TransportError as e:
+                QUESTION_SERVICE_LATENCY.labels(route, "error").observe(time.perf_counter() - start)
+                QUESTION_SERVICE_ERRORS.labels(route, _error_reason(e)).inc()
+                if attempt >= self.max_retries:
+                    self.breaker.record_failure()
+                    raise
+
+            QUESTION_SERVICE_RETRIES.labels(route).inc()
+            await asyncio.sleep(self._backoff(attempt))
+            attempt += 1
+
+
+question_client = QuestionServiceClient()
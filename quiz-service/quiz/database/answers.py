@@ -0,0 +1,144 @@
+import uuid
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import update, select, literal, literal_column, values, column, func, true, String, Integer
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.quizmodel import QuizSession as QuizSessionORM, Answer as AnswerORM
+from database.grading import within_time_limit
+
+answers = AnswerORM.__table__
+quiz_sessions = QuizSessionORM.__table__
+
+
+async def save_answers(
+    db: AsyncSession,
+    session_id: str,
+    user_id: str,
+    selections: Iterable[Tuple[str, int]],
+) -> List[RowMapping]:
+    """
+    Insert or update answers and advance session progress in one statement.
+
+        WITH locked AS (
+            SELECT id FROM quiz_sessions
+            WHERE id = :session_id AND user_id = :user_id AND is_active
+              AND (time_limit_seconds IS NULL OR deadline > :now - grace)
+            FOR UPDATE
+        ), upserted AS (
+            INSERT INTO answers (...)
+            SELECT ... FROM (VALUES ...) AS incoming JOIN locked ON true
+            ON CONFLICT (quiz_session_id, quiz_question_id, attempt_number)
+            DO UPDATE SET selected_option = excluded.selected_option, revision_count = answers.revision_count + 1, ...
+            RETURNING answers.*, xmax = 0 AS inserted
+        ), progress AS (
+            UPDATE quiz_sessions
+            SET question_progress_index = least(question_count, question_progress_index
+                + (SELECT count(*) FROM upserted WHERE inserted))
+            WHERE id IN (SELECT id FROM locked)
+        )
+        SELECT ... FROM upserted
+
+    `selections` are (quiz_question_id, selected_option) pairs; if a question
+    appears more than once the last one wins. Progress advances by the
+    answers actually inserted (xmax = 0 on the upserted row), so resending
+    or revising an answer does not count twice. The session row is locked
+    and its state re-checked before anything is written, so a submit or
+    expiry committing concurrently leaves nothing to insert, and the
+    increment is done by the database, so concurrent requests for the same
+    session cannot lose progress updates. Returns the stored answers, or an
+    empty list if the session is not (or no longer) active or its time
+    limit has passed.
+    """
+    latest = dict(selections)
+    if not latest:
+        return []
+    now = datetime.utcnow()
+
+    locked = (
+        select(quiz_sessions.c.id)
+        .where(
+            quiz_sessions.c.id == session_id,
+            quiz_sessions.c.user_id == user_id,
+            quiz_sessions.c.is_active.is_(True),
+            within_time_limit(now),
+        )
+        .with_for_update()
+        .cte("locked")
+    )
+
+    incoming = values(
+        column("id", String),
+        column("quiz_question_id", String),
+        column("selected_option", Integer),
+        name="incoming",
+    ).data([
+        (str(uuid.uuid4()), question_id, selected_option)
+        for question_id, selected_option in latest.items()
+    ])
+
+    # Only insert if the session is active, within its time limit and owned by the user
+    rows = select(
+        incoming.c.id,
+        locked.c.id,
+        incoming.c.quiz_question_id,
+        incoming.c.selected_option,
+        literal(0),
+        literal(1),  # Exam-style, only attempt 1
+        literal(now),
+    ).select_from(incoming.join(locked, true()))
+
+    upsert = pg_insert(answers).from_select(
+        [
+            answers.c.id,
+            answers.c.quiz_session_id,
+            answers.c.quiz_question_id,
+            answers.c.selected_option,
+            answers.c.revision_count,
+            answers.c.attempt_number,
+            answers.c.answered_at,
+        ],
+        rows,
+    )
+    upserted = (
+        upsert.on_conflict_do_update(
+            index_elements=[answers.c.quiz_session_id, answers.c.quiz_question_id, answers.c.attempt_number],
+            set_={
+                "selected_option": upsert.excluded.selected_option,
+                "revision_count": answers.c.revision_count + 1,
+                "updated_at": now,
+                "submitted_at": now,
+            },
+        )
+        # xmax is 0 on a freshly inserted row and set on one updated by ON CONFLICT
+        .returning(*answers.c, (literal_column("xmax") == 0).label("inserted"))
+        .cte("upserted")
+    )
+
+    inserted_count = select(func.count()).where(upserted.c.inserted).scalar_subquery()
+    progress = (
+        update(quiz_sessions)
+        .where(quiz_sessions.c.id.in_(select(locked.c.id)))
+        .values(question_progress_index=func.least(
+            quiz_sessions.c.question_count,
+            quiz_sessions.c.question_progress_index + inserted_count,
+        ))
+        .cte("progress")
+    )
+
+    stmt = select(*(upserted.c[name] for name in answers.c.keys())).add_cte(progress)
+    result = await db.execute(stmt)
+    return result.mappings().all()
+
+
+async def save_answer(
+    db: AsyncSession,
+    session_id: str,
+    user_id: str,
+    question_id: str,
+    selected_option: int,
+) -> Optional[RowMapping]:
+    """Single-answer form of save_answers; None if the session is not active"""
+    saved = await save_answers(db, session_id, user_id, [(question_id, selected_option)])
+    return saved[0] if saved else None
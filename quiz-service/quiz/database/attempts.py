@@ -0,0 +1,86 @@
+import uuid
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import insert, select, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.quizmodel import QuizSession as QuizSessionORM, QuizAttemptCounter
+
+quiz_sessions = QuizSessionORM.__table__
+counters = QuizAttemptCounter.__table__
+
+
+async def start_attempt(
+    db: AsyncSession,
+    quiz_id: str,
+    user_id: str,
+    question_count: int,
+    time_limit_seconds: Optional[int],
+    max_attempts: Optional[int],
+) -> Optional[RowMapping]:
+    """
+    Reserve the user's next attempt number and create the session in one statement.
+
+        WITH reserved AS (
+            INSERT INTO quiz_attempt_counters (quiz_id, user_id, attempts) VALUES (:quiz_id, :user_id, 1)
+            ON CONFLICT (quiz_id, user_id) DO UPDATE SET attempts = quiz_attempt_counters.attempts + 1
+            WHERE quiz_attempt_counters.attempts < :max_attempts
+            RETURNING attempts
+        )
+        INSERT INTO quiz_sessions (...) SELECT ..., reserved.attempts, ... FROM reserved
+        RETURNING quiz_sessions.*
+
+    The counter row is locked by the upsert, so concurrent starts get
+    distinct attempt numbers and cannot both slip past the limit. No
+    count(*) over the user's history is needed. Returns the new session, or
+    None when the attempt limit is reached. `max_attempts` of None or 0
+    means unlimited.
+    """
+    reserve = pg_insert(counters).values(quiz_id=quiz_id, user_id=user_id, attempts=1)
+    reserve = reserve.on_conflict_do_update(
+        index_elements=[counters.c.quiz_id, counters.c.user_id],
+        set_={"attempts": counters.c.attempts + 1},
+        where=(counters.c.attempts < max_attempts) if max_attempts else None,
+    ).returning(counters.c.attempts).cte("reserved")
+
+    new_session = select(
+        literal(str(uuid.uuid4())),
+        literal(quiz_id),
+        literal(user_id),
+        literal(question_count),
+        literal(time_limit_seconds),
+        reserve.c.attempts,
+        literal(0),
+        literal(0),
+        literal(0),
+        literal(0),
+        literal(True),
+        literal(datetime.utcnow()),
+    )
+
+    stmt = (
+        insert(quiz_sessions)
+        .from_select(
+            [
+                quiz_sessions.c.id,
+                quiz_sessions.c.quiz_id,
+                quiz_sessions.c.user_id,
+                quiz_sessions.c.question_count,
+                quiz_sessions.c.time_limit_seconds,
+                quiz_sessions.c.attempt_number,
+                quiz_sessions.c.question_progress_index,
+                quiz_sessions.c.score,
+                quiz_sessions.c.wrong_answers,
+                quiz_sessions.c.unanswered_questions,
+                quiz_sessions.c.is_active,
+                quiz_sessions.c.started_at,
+            ],
+            new_session,
+        )
+        .returning(*quiz_sessions.c)
+        .add_cte(reserve)
+    )
+
+    result = await db.execute(stmt)
+    return result.mappings().one_or_none()
@@ -0,0 +1,139 @@
+import os
+from datetime import datetime, timedelta
+from typing import Sequence
+from sqlalchemy import update, select, func, case, literal_column, Interval
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.quizmodel import QuizQuestion as QuizQuestionORM, QuizSession as QuizSessionORM, Answer as AnswerORM
+
+answers = AnswerORM.__table__
+quiz_questions = QuizQuestionORM.__table__
+quiz_sessions = QuizSessionORM.__table__
+
+# When a timed session runs out (NULL without a time limit). Written so it matches
+# ix_quiz_sessions_active_deadline: timestamp + integer * interval is immutable
+deadline = quiz_sessions.c.started_at + quiz_sessions.c.time_limit_seconds * literal_column("interval '1 second'", Interval)
+
+# Answers sent just before the deadline may arrive a little after it (network,
+# retries): they are still taken this long after, and the sweep waits as long
+DEADLINE_GRACE = timedelta(seconds=float(os.getenv("SESSION_DEADLINE_GRACE_SECONDS", "5")))
+
+
+def within_time_limit(now: datetime):
+    """Sessions that may still take answers at `now` (naive UTC, like the stored timestamps)"""
+    return quiz_sessions.c.time_limit_seconds.is_(None) | (deadline > now - DEADLINE_GRACE)
+
+
+async def grade_sessions(
+    db: AsyncSession,
+    session_ids: Sequence[str],
+    completion_details: str = "completed",
+) -> Sequence[Row]:
+    """
+    Grade quiz sessions and close them in a single statement.
+
+        WITH graded AS (
+            UPDATE answers SET is_correct = (selected_option = correct_option), graded_at = now
+            FROM quiz_questions, quiz_sessions WHERE ... RETURNING quiz_session_id, is_correct
+        )
+        UPDATE quiz_sessions SET score = counts.correct, wrong_answers = counts.wrong, ...
+        FROM (SELECT id, count(*) FILTER (...) ... FROM quiz_sessions LEFT JOIN graded ... GROUP BY id) AS counts
+        WHERE quiz_sessions.id = counts.id AND is_active
+        RETURNING ...
+
+    The number of statements depends neither on the number of questions nor
+    on the number of sessions. Only exam-style first attempts are graded.
+    A session closed after its deadline is recorded as "timeout" whatever
+    `completion_details` says, with completed_at at the deadline (answers
+    are refused once it and DEADLINE_GRACE pass, see database/answers.py;
+    those taken during the grace period are graded). Returns the
+    updated columns of the sessions that were still active (the others were
+    already submitted).
+    """
+    now = datetime.utcnow()
+
+    graded = (
+        update(answers)
+        .where(
+            answers.c.quiz_session_id.in_(session_ids),
+            answers.c.attempt_number == 1,  # Exam-style, only attempt 1
+            answers.c.quiz_question_id == quiz_questions.c.id,
+            answers.c.quiz_session_id == quiz_sessions.c.id,
+            quiz_questions.c.quiz_id == quiz_sessions.c.quiz_id,
+            quiz_sessions.c.is_active.is_(True),
+        )
+        .values(
+            is_correct=answers.c.selected_option == quiz_questions.c.correct_option,
+            graded_at=now,
+        )
+        .returning(answers.c.quiz_session_id, answers.c.is_correct)
+        .cte("graded")
+    )
+
+    graded_sessions = quiz_sessions.alias("graded_sessions")
+    counts = (
+        select(
+            graded_sessions.c.id,
+            func.count().filter(graded.c.is_correct.is_(True)).label("correct"),
+            func.count().filter(graded.c.is_correct.is_(False)).label("wrong"),
+            func.count(graded.c.quiz_session_id).label("answered"),
+        )
+        .select_from(graded_sessions.outerjoin(graded, graded.c.quiz_session_id == graded_sessions.c.id))
+        .where(graded_sessions.c.id.in_(session_ids))
+        .group_by(graded_sessions.c.id)
+        .subquery("counts")
+    )
+
+    stmt = (
+        update(quiz_sessions)
+        .where(
+            quiz_sessions.c.id == counts.c.id,
+            quiz_sessions.c.is_active.is_(True),
+        )
+        .values(
+            score=counts.c.correct,
+            wrong_answers=counts.c.wrong,
+            unanswered_questions=quiz_sessions.c.question_count - counts.c.answered,
+            is_active=False,
+            completed_at=case((deadline < now, deadline), else_=now),
+            completion_details=case((deadline < now, "timeout"), else_=completion_details),
+        )
+        .returning(
+            quiz_sessions.c.id,
+            quiz_sessions.c.user_id,
+            quiz_sessions.c.score,
+            quiz_sessions.c.wrong_answers,
+            quiz_sessions.c.unanswered_questions,
+            quiz_sessions.c.is_active,
+            quiz_sessions.c.completed_at,
+            quiz_sessions.c.completion_details,
+        )
+        .add_cte(graded)
+    )
+
+    result = await db.execute(stmt)
+    return result.all()
+
+
+async def lock_expired_sessions(db: AsyncSession, limit: int) -> Sequence[str]:
+    """
+    Ids of up to `limit` active sessions past their deadline (and the grace
+    period answers still get), oldest deadline first.
+
+    The rows are locked FOR UPDATE SKIP LOCKED until the transaction ends:
+    replicas running the same sweep take disjoint batches, and a concurrent
+    submit of one of these sessions waits, then finds it already closed.
+    """
+    stmt = (
+        select(quiz_sessions.c.id)
+        .where(
+            quiz_sessions.c.is_active,
+            quiz_sessions.c.time_limit_seconds.is_not(None),
+            deadline < datetime.utcnow() - DEADLINE_GRACE,
+        )
+        .order_by(deadline)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.scalars(stmt)
+    return result.all()
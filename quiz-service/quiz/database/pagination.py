@@ -0,0 +1,61 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from sqlalchemy import DateTime, tuple_
+from sqlalchemy.sql import Select
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Pack the sort-key values of the last row into an opaque string"""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> List[Any]:
+    """Unpack a cursor produced by encode_cursor for the given sort columns"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match sort key")
+        return [
+            datetime.fromisoformat(v) if isinstance(col.type, DateTime) else v
+            for v, col in zip(values, columns)
+        ]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+
+def paginate(query: Select, columns: Sequence, cursor: Optional[str], limit: int, descending: bool = False) -> Select:
+    """
+    Apply keyset pagination to `query`.
+
+    Rows are ordered by `columns` (which must be unique together, e.g.
+    (created_at, id)) and only rows after the cursor are selected, so the
+    database seeks straight to the page instead of skipping OFFSET rows.
+    One extra row is fetched to tell whether another page exists.
+    With `descending` every column is sorted newest / largest first.
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        if descending:
+            query = query.where(tuple_(*columns) < tuple_(*values))
+        else:
+            query = query.where(tuple_(*columns) > tuple_(*values))
+    order = [col.desc() for col in columns] if descending else columns
+    return query.order_by(*order).limit(limit + 1)
+
+
+def build_page(rows: Sequence, columns: Sequence, limit: int) -> Tuple[list, Optional[str]]:
+    """Split the rows fetched by `paginate` into the page items and the next cursor"""
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, col.key) for col in columns])
+    return items, next_cursor
@@ -0,0 +1,256 @@
+from datetime import datetime
+from typing import Optional, Sequence
+from sqlalchemy import select, delete, func, cast, case, literal, tuple_, Float, BigInteger
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.quizmodel import Quiz as QuizORM, QuizSession as QuizSessionORM, QuizStats, UserQuizProgress, UserTopicMastery
+
+quizzes = QuizORM.__table__
+quiz_sessions = QuizSessionORM.__table__
+quiz_stats = QuizStats.__table__
+user_quiz_progress = UserQuizProgress.__table__
+user_topic_mastery = UserTopicMastery.__table__
+
+sessions_with_quiz = quiz_sessions.join(quizzes, quizzes.c.id == quiz_sessions.c.quiz_id)
+
+# Same arithmetic as QuizSession.time_taken_seconds / .passed, so rollups agree with the per-session views
+time_taken_seconds = cast(
+    func.floor(func.extract("epoch", quiz_sessions.c.completed_at - quiz_sessions.c.started_at)), BigInteger
+)
+passed = (quiz_sessions.c.question_count > 0) & (
+    cast(quiz_sessions.c.score, Float) / quiz_sessions.c.question_count * 100 > quizzes.c.passing_ratio * 100
+)
+
+
+async def _apply_to_quiz_stats(db: AsyncSession, session_ids: Sequence[str], sign: int):
+    now = datetime.utcnow()
+    totals = (
+        select(
+            quiz_sessions.c.quiz_id,
+            sign * func.count(),
+            sign * func.count().filter(passed),
+            sign * func.coalesce(func.sum(quiz_sessions.c.score), 0),
+            sign * func.coalesce(func.sum(time_taken_seconds), 0),
+            literal(now),
+        )
+        .select_from(sessions_with_quiz)
+        .where(quiz_sessions.c.id.in_(session_ids), ~quiz_sessions.c.is_active)
+        .group_by(quiz_sessions.c.quiz_id)
+    )
+
+    stmt = pg_insert(quiz_stats).from_select(
+        ["quiz_id", "attempts", "passed", "score_total", "time_taken_seconds_total", "updated_at"], totals
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[quiz_stats.c.quiz_id],
+        set_={
+            "attempts": quiz_stats.c.attempts + stmt.excluded.attempts,
+            "passed": quiz_stats.c.passed + stmt.excluded.passed,
+            "score_total": quiz_stats.c.score_total + stmt.excluded.score_total,
+            "time_taken_seconds_total": quiz_stats.c.time_taken_seconds_total + stmt.excluded.time_taken_seconds_total,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    await db.execute(stmt)
+
+
+async def _apply_to_user_topic_mastery(db: AsyncSession, session_ids: Sequence[str], sign: int):
+    totals = (
+        select(
+            quiz_sessions.c.user_id,
+            quizzes.c.topic_id,
+            func.max(quizzes.c.topic_name),
+            sign * func.count(),
+            sign * func.count().filter(passed),
+            sign * func.coalesce(func.sum(quiz_sessions.c.question_count), 0),
+            sign * func.coalesce(func.sum(quiz_sessions.c.score), 0),
+            func.max(quiz_sessions.c.completed_at),
+        )
+        .select_from(sessions_with_quiz)
+        .where(quiz_sessions.c.id.in_(session_ids), ~quiz_sessions.c.is_active)
+        .group_by(quiz_sessions.c.user_id, quizzes.c.topic_id)
+    )
+
+    stmt = pg_insert(user_topic_mastery).from_select(
+        ["user_id", "topic_id", "topic_name", "attempts", "passed", "questions_total", "correct_total",
+         "last_completed_at"],
+        totals,
+    )
+    t, excluded = user_topic_mastery.c, stmt.excluded
+    updates = {
+        "topic_name": excluded.topic_name,
+        "attempts": t.attempts + excluded.attempts,
+        "passed": t.passed + excluded.passed,
+        "questions_total": t.questions_total + excluded.questions_total,
+        "correct_total": t.correct_total + excluded.correct_total,
+    }
+    if sign > 0:
+        updates["last_completed_at"] = func.greatest(t.last_completed_at, excluded.last_completed_at)
+    stmt = stmt.on_conflict_do_update(index_elements=[t.user_id, t.topic_id], set_=updates)
+    await db.execute(stmt)
+
+
+def _user_quiz_totals(condition):
+    """Progress rows per (user, quiz) over the completed sessions matching `condition`"""
+    latest_first = (quiz_sessions.c.completed_at.desc(), quiz_sessions.c.id.desc())
+    return (
+        select(
+            quiz_sessions.c.user_id,
+            quizzes.c.id,
+            quizzes.c.name,
+            quizzes.c.topic_id,
+            quizzes.c.question_count,
+            func.count(),
+            func.count().filter(passed),
+            func.max(quiz_sessions.c.score),
+            func.array_agg(aggregate_order_by(quiz_sessions.c.score, *latest_first))[1],
+            func.array_agg(aggregate_order_by(quiz_sessions.c.id, *latest_first))[1],
+            func.max(quiz_sessions.c.completed_at),
+        )
+        .select_from(sessions_with_quiz)
+        .where(condition, ~quiz_sessions.c.is_active)
+        .group_by(quiz_sessions.c.user_id, quizzes.c.id)
+    )
+
+
+USER_QUIZ_PROGRESS_COLUMNS = [
+    "user_id", "quiz_id", "quiz_name", "topic_id", "question_count",
+    "attempts", "passed", "best_score", "last_score", "last_session_id", "last_completed_at",
+]
+
+
+async def _add_to_user_quiz_progress(db: AsyncSession, session_ids: Sequence[str]):
+    stmt = pg_insert(user_quiz_progress).from_select(
+        USER_QUIZ_PROGRESS_COLUMNS, _user_quiz_totals(quiz_sessions.c.id.in_(session_ids))
+    )
+    t, excluded = user_quiz_progress.c, stmt.excluded
+    newer = excluded.last_completed_at >= t.last_completed_at
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[t.user_id, t.quiz_id],
+        set_={
+            "attempts": t.attempts + excluded.attempts,
+            "passed": t.passed + excluded.passed,
+            "best_score": func.greatest(t.best_score, excluded.best_score),
+            "last_score": case((newer, excluded.last_score), else_=t.last_score),
+            "last_session_id": case((newer, excluded.last_session_id), else_=t.last_session_id),
+            "last_completed_at": func.greatest(t.last_completed_at, excluded.last_completed_at),
+        },
+    )
+    await db.execute(stmt)
+
+
+async def _rebuild_user_quiz_progress(db: AsyncSession, removed_ids: Sequence[str]):
+    """Best / last score cannot be subtracted: recompute the affected (user, quiz) rows without the removed sessions"""
+    result = await db.execute(
+        select(quiz_sessions.c.user_id, quiz_sessions.c.quiz_id)
+        .where(quiz_sessions.c.id.in_(removed_ids), ~quiz_sessions.c.is_active)
+        .distinct()
+    )
+    pairs = [tuple(row) for row in result.all()]
+    if not pairs:
+        return
+
+    await db.execute(
+        delete(user_quiz_progress).where(tuple_(user_quiz_progress.c.user_id, user_quiz_progress.c.quiz_id).in_(pairs))
+    )
+    remaining = tuple_(quiz_sessions.c.user_id, quiz_sessions.c.quiz_id).in_(pairs) & quiz_sessions.c.id.not_in(removed_ids)
+    await db.execute(
+        pg_insert(user_quiz_progress).from_select(USER_QUIZ_PROGRESS_COLUMNS, _user_quiz_totals(remaining))
+    )
+
+
+async def add_completed_sessions(db: AsyncSession, session_ids: Sequence[str]):
+    """
+    Fold newly completed sessions into the rollups: quiz_stats,
+    user_quiz_progress and user_topic_mastery.
+
+        INSERT INTO quiz_stats (quiz_id, attempts, passed, ...)
+        SELECT quiz_id, count(*), count(*) FILTER (WHERE passed), ...
+        FROM quiz_sessions JOIN quizzes ... WHERE id IN (:session_ids) AND NOT is_active
+        GROUP BY quiz_id
+        ON CONFLICT (quiz_id) DO UPDATE SET attempts = quiz_stats.attempts + excluded.attempts, ...
+
+    Run it in the transaction that closes the sessions (after grading), so
+    the totals commit or roll back together with the sessions. One statement
+    per rollup whatever the number of sessions, so batches of closed
+    sessions cost the same as one.
+    """
+    if session_ids:
+        await _apply_to_quiz_stats(db, session_ids, 1)
+        await _add_to_user_quiz_progress(db, session_ids)
+        await _apply_to_user_topic_mastery(db, session_ids, 1)
+
+
+async def remove_completed_sessions(db: AsyncSession, session_ids: Sequence[str]):
+    """Take completed sessions out of the rollups; run before deleting them"""
+    if session_ids:
+        await _apply_to_quiz_stats(db, session_ids, -1)
+        await _rebuild_user_quiz_progress(db, session_ids)
+        await _apply_to_user_topic_mastery(db, session_ids, -1)
+
+
+async def get_quiz_stats(db: AsyncSession, quiz_id: str) -> Optional[Row]:
+    """
+    The quiz's rollup row (primary-key lookup), or None if the quiz does not exist.
+
+    Quizzes without completed sessions have no stats row yet: their totals
+    come back as NULL.
+    """
+    stmt = (
+        select(
+            quizzes.c.id.label("quiz_id"),
+            quizzes.c.question_count,
+            quiz_stats.c.attempts,
+            quiz_stats.c.passed,
+            quiz_stats.c.score_total,
+            quiz_stats.c.time_taken_seconds_total,
+            quiz_stats.c.updated_at,
+        )
+        .select_from(quizzes.outerjoin(quiz_stats, quiz_stats.c.quiz_id == quizzes.c.id))
+        .where(quizzes.c.id == quiz_id)
+    )
+    result = await db.execute(stmt)
+    return result.one_or_none()
+
+
+async def get_leaderboard(db: AsyncSession, quiz_id: str, limit: int) -> Sequence[Row]:
+    """
+    Top `limit` completed sessions of a quiz: highest score, then shortest
+    time, then earliest completion.
+
+    The order matches ix_quiz_sessions_leaderboard, so Postgres reads the
+    first `limit` index entries and stops; nothing is sorted.
+    """
+    stmt = (
+        select(
+            quiz_sessions.c.id,
+            quiz_sessions.c.user_id,
+            quiz_sessions.c.attempt_number,
+            quiz_sessions.c.score,
+            quiz_sessions.c.question_count,
+            quiz_sessions.c.started_at,
+            quiz_sessions.c.completed_at,
+            quiz_sessions.c.completion_details,
+        )
+        .where(quiz_sessions.c.quiz_id == quiz_id, ~quiz_sessions.c.is_active)
+        .order_by(
+            quiz_sessions.c.score.desc(),
+            quiz_sessions.c.completed_at - quiz_sessions.c.started_at,
+            quiz_sessions.c.completed_at,
+            quiz_sessions.c.id,
+        )
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+    return result.all()
+
+
+async def get_user_topic_mastery(db: AsyncSession, user_id: str) -> Sequence[Row]:
+    """All of the user's per-topic rows (primary-key range): one per topic attempted"""
+    result = await db.execute(
+        select(user_topic_mastery)
+        .where(user_topic_mastery.c.user_id == user_id, user_topic_mastery.c.attempts > 0)
+        .order_by(user_topic_mastery.c.topic_name, user_topic_mastery.c.topic_id)
+    )
+    return result.all()
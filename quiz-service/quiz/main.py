@@ -1,25 +1,70 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Request, Response
+from fastapi import FastAPI, Depends, HTTPException, Query, status, Request, Response
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
-from sqlalchemy import func, update
-from database.quizdb import get_async_session, init_db, reset_db
-from models.quizmodel import Quiz as QuizORM, QuizQuestion as QuizQuestionORM, QuizSession as QuizSessionORM, Answer as AnswerORM
-from schema.quizschema import QuizRequest as QuizRequestSchema, Quiz as QuizSchema, QuizDetails as QuizDetailsSchema, QuizFilter, AnswerSubmitRequest, QuestionForClient, QuizSession as QuizSessionSchema, QuizSessionFilter, QuizSessionDetails
-from schema.quizschema import QuizSessionSummary as QuizSummary
+from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import func
+from database.quizdb import engine, replica_engine, get_async_session, get_read_session, init_db, reset_db
+from database.pagination import paginate, build_page, InvalidCursorError
+from database.grading import grade_sessions
+from database.answers import save_answer, save_answers
+from database.attempts import start_attempt
+from database.rollups import add_completed_sessions, remove_completed_sessions, get_quiz_stats, get_leaderboard, get_user_topic_mastery
+from cache.snapshots import snapshot_cache, get_quiz_snapshot, store_quiz_snapshot, QuizSnapshot
+from cache.backends import cache
+from cache.policies import (
+    quiz_list_key, session_list_key, invalidate_quiz, invalidate_session_lists,
+    QUIZ_LIST_TTL, SESSION_LIST_TTL,
+)
+from models.quizmodel import Quiz as QuizORM, QuizQuestion as QuizQuestionORM, QuizSession as QuizSessionORM, Answer as AnswerORM, UserQuizProgress as UserQuizProgressORM
+from schema.quizschema import QuizRequest as QuizRequestSchema, Quiz as QuizSchema, QuizDetails as QuizDetailsSchema, QuizFilter, AnswerSubmitRequest, QuestionForClient, QuizSession as QuizSessionSchema, QuizSessionFilter, QuizSessionDetails, Page
+from schema.quizschema import QuizSessionSummary as QuizSummary, Answer as AnswerSchema, AnswerBatchRequest, QuizSessionBootstrap
+from schema.quizschema import QuizStats as QuizStatsSchema, QuizLeaderboard, UserProgress, UserProgressFilter
+from utils.httpcache import make_etag, is_not_modified, not_modified, IMMUTABLE, REVALIDATE, SHARED_REVALIDATE
+from utils.serialization import respond
+from monitoring.metrics import MetricsMiddleware, metrics_response, monitor_event_loop, mark_worker_stopped
+from monitoring.sqlstats import SQLStatsMiddleware
+from monitoring.tracing import setup_tracing, shutdown_tracing, trace_queries, TracingMiddleware
+from contextlib import asynccontextmanager, suppress
 from typing import List
-from datetime import datetime
+from client.questionclient import question_client, CircuitOpenError
+from tasks.expiry import run_expiry_scheduler, EXPIRY_INTERVAL_SECONDS
+import asyncio
 import httpx
-import os
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup
+    await init_db()
+    await question_client.start()
+    loop_monitor = asyncio.create_task(monitor_event_loop())
+    # Closes timed-out sessions (SESSION_EXPIRY_INTERVAL_SECONDS=0 turns it off)
+    expiry = asyncio.create_task(run_expiry_scheduler()) if EXPIRY_INTERVAL_SECONDS > 0 else None
+    yield
+    # Shutdown (after in-flight requests have drained)
+    loop_monitor.cancel()
+    if expiry is not None:
+        # Wait for a batch in progress to roll back before the pool is disposed
+        expiry.cancel()
+        with suppress(asyncio.CancelledError):
+            await expiry
+    await question_client.close()
+    await cache.close()
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+    shutdown_tracing()
+    mark_worker_stopped()
 
 # Create FastAPI application instance
 app = FastAPI(
     title="Quiz Service - Quiz API",
     description="Quiz application",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -29,25 +74,27 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(SQLStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+# Outermost, so the request span covers everything else (TRACING_EXPORTER, off by default)
+if setup_tracing("quiz-service"):
+    app.add_middleware(TracingMiddleware)
+    trace_queries(engine)
+    if replica_engine is not None:
+        trace_queries(replica_engine)
 
-BASE = os.getenv("QUESTION_SERVICE_BASE_URL", "http://question-service:8000")
-
-QUESTIONS_URL = f"{BASE}/questions/"
-TOPICS_URL = f"{BASE}/topics/"
-
+TOPICS_PATH = "/topics/"
 
-async def fetch_topic_from_service(topic_id: str) -> dict:
-    """
-    Fetch topic information from question-service.
-    Used to get topic name for denormalization in Quiz model.
-    """
-    url = f"{TOPICS_URL}{topic_id}"
 
+async def _get_from_question_service(path: str, params: dict | None = None, route: str | None = None):
+    """GET from question-service through the shared client, mapping failures to HTTP errors."""
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.json()
+        return await question_client.get_json(path, params=params, route=route)
+    except CircuitOpenError:
+        raise HTTPException(
+            status_code=503,
+            detail="Question service unavailable (circuit open)"
+        )
     except httpx.TimeoutException:
         raise HTTPException(
             status_code=503,
@@ -58,6 +105,16 @@ async def fetch_topic_from_service(topic_id: str) -> dict:
             status_code=503,
             detail="Question service unavailable (connection refused)"
         )
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Not found in question service: {path}"
+            )
+        raise HTTPException(
+            status_code=502,
+            detail=f"Error from question service: {str(e)}"
+        )
     except httpx.HTTPError as e:
         raise HTTPException(
             status_code=502,
@@ -65,38 +122,21 @@ async def fetch_topic_from_service(topic_id: str) -> dict:
         )
 
 
-async def fetch_questions_from_service(request: QuizRequestSchema) -> List[dict]:
+async def fetch_quiz_composition(request: QuizRequestSchema) -> dict:
     """
-    Fetch questions from question-service (inter-service HTTP call).
-    
-    Implements API composition pattern from theory section 6.
+    Fetch topic info and the question sample from question-service in one call.
+
+    Implements API composition pattern from theory section 6. The topic name
+    is used for denormalization in the Quiz model.
     """
-    payload = request.model_dump(exclude={"name", "time_limit_seconds", "passing_ratio", "number_of_attempts"})
+    payload = request.model_dump(include={"limit", "randomize"})
     clean_payload = filter_none(payload)
-    clean_payload["is_public"] = True
 
-    url = httpx.URL(QUESTIONS_URL, params=clean_payload)
-
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.json()
-    except httpx.TimeoutException:
-        raise HTTPException(
-            status_code=503,
-            detail="Question service unavailable (timeout)"
-        )
-    except httpx.ConnectError:
-        raise HTTPException(
-            status_code=503,
-            detail="Question service unavailable (connection refused)"
-        )
-    except httpx.HTTPError as e:
-        raise HTTPException(
-            status_code=502,
-            detail=f"Error from question service: {str(e)}"
-        )
+    return await _get_from_question_service(
+        f"{TOPICS_PATH}{request.topic_id}/quiz-composition",
+        params=clean_payload,
+        route=f"{TOPICS_PATH}{{topic_id}}/quiz-composition",
+    )
 
 
 def filter_none(d: dict) -> dict:
@@ -112,6 +152,7 @@ async def __get_q_session(
         db: AsyncSession,
         require_active: bool = False,
         get_details: bool = False,
+        with_quiz: bool = False,
     ) -> QuizSessionORM:
     stmt = (
         select(QuizSessionORM)
@@ -122,11 +163,11 @@ async def __get_q_session(
     )
 
     if get_details:
-        stmt = stmt.options(
-            selectinload(QuizSessionORM.quiz),
-            selectinload(QuizSessionORM.answers),
-            selectinload(QuizSessionORM.quiz).selectinload(QuizORM.questions)
-        )
+        # QuizSessionDetails only adds the answers
+        stmt = stmt.options(selectinload(QuizSessionORM.answers))
+    if with_quiz:
+        # QuizSession.passed needs the quiz's passing_ratio (many-to-one: same query)
+        stmt = stmt.options(joinedload(QuizSessionORM.quiz))
 
     result = await db.execute(stmt)
     qsession = result.scalar_one_or_none()
@@ -153,17 +194,19 @@ async def get_quiz_session(
 ) -> QuizSessionORM:
     return await __get_q_session(session_id, current_user, db, get_details=True)
 
-async def get_active_quiz_session(
+async def get_quiz_session_with_quiz(
     session_id: str,
     current_user: str = Depends(get_current_user),
-    db: AsyncSession = Depends(get_async_session)
+    db: AsyncSession = Depends(get_async_session),
 ) -> QuizSessionORM:
+    return await __get_q_session(session_id, current_user, db, with_quiz=True)
 
-    return await __get_q_session(session_id, current_user, db, require_active=True, get_details=True)
-
-@app.on_event("startup")
-async def on_startup():
-    await init_db()
+async def get_active_quiz_session_summary(
+    session_id: str,
+    current_user: str = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_session)
+) -> QuizSessionORM:
+    return await __get_q_session(session_id, current_user, db, require_active=True)
 
 @app.exception_handler(IntegrityError)
 async def integrity_error_handler(request: Request, exc: IntegrityError):
@@ -176,6 +219,13 @@ async def integrity_error_handler(request: Request, exc: IntegrityError):
         }
     )
 
+@app.exception_handler(InvalidCursorError)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    return JSONResponse(
+        status_code=400,
+        content={"detail": str(exc)}
+    )
+
 # Create quiz (caches questions from question-service)
 @app.post("/quizzes/")
 async def create_quiz(
@@ -187,15 +237,14 @@ async def create_quiz(
     Create a new quiz by fetching questions from question-service.
 
     This endpoint demonstrates the API composition pattern:
-    1. Fetch questions from question-service (inter-service call)
+    1. Fetch topic and questions from question-service (one inter-service call)
     2. Create quiz template in our database
     3. Cache question snapshots (prevents changes affecting active quizzes)
     """
-    # Fetch topic information to get topic_name (denormalization pattern)
-    topic = await fetch_topic_from_service(request.topic_id)
-
-    # Fetch questions from question service
-    questions = await fetch_questions_from_service(request)
+    # Fetch topic (for topic_name, denormalization pattern) and questions in one hop
+    composition = await fetch_quiz_composition(request)
+    topic = composition["topic"]
+    questions = composition["questions"]
 
     # Validate we have enough questions
     if len(questions) == 0:
@@ -238,14 +287,19 @@ async def create_quiz(
 
     session.add(quiz)
     await session.commit()
+
+    # Questions are already in memory: warm the snapshot caches (before refresh unloads them)
+    await store_quiz_snapshot(QuizSnapshot.from_orm(quiz))
+    await invalidate_quiz()
+
     await session.refresh(quiz)   # ensures quiz.id and timestamps are available
     return quiz
 
 
 # List quizzes with filters
-@app.get("/quizzes/", response_model=List[QuizSchema])
-async def get_quiz(filters: QuizFilter = Depends(), session: AsyncSession = Depends(get_async_session)):
-    """List quizzes with optional filters"""
+@app.get("/quizzes/", response_model=Page[QuizSchema])
+async def get_quiz(filters: QuizFilter = Depends(), session: AsyncSession = Depends(get_read_session)):
+    """List quizzes with optional filters, one page at a time ordered by (created_at, id)"""
     query = select(QuizORM)
 
     if filters.user_id:
@@ -270,19 +324,48 @@ async def get_quiz(filters: QuizFilter = Depends(), session: AsyncSession = Depe
     if filters.max_question_count:
         query = query.filter(QuizORM.question_count <= filters.max_question_count)
 
-    result = await session.execute(query)
-    quizzes = result.scalars().all()
-    return quizzes
+    cache_key = await quiz_list_key(filters.model_dump())
+    cached = await cache.get(cache_key) if cache_key else None
+    if cached is not None:
+        return respond(None, cached)
+
+    order = (QuizORM.created_at, QuizORM.id)
+    result = await session.execute(paginate(query, order, filters.cursor, filters.limit))
+    quizzes, next_cursor = build_page(result.scalars().all(), order, filters.limit)
+
+    page = Page[QuizSchema].model_validate(
+        {"items": quizzes, "next_cursor": next_cursor}, from_attributes=True
+    ).model_dump(mode="json")
+    if cache_key:
+        await cache.set(cache_key, page, ttl=QUIZ_LIST_TTL)
+    return respond(None, page)
 
 
 # Get quiz details with cached questions
 @app.get("/quizzes/{quiz_id}", response_model=QuizDetailsSchema)
-async def get_quiz_details(quiz_id: str, session: AsyncSession = Depends(get_async_session)):
-    """Get quiz with all cached questions"""
-    qz = await session.get(QuizORM, quiz_id, options=(selectinload(QuizORM.questions),))
+async def get_quiz_details(
+    quiz_id: str,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Get quiz with all cached questions.
+
+    A quiz never changes after creation, so its ETag comes from the snapshot
+    cache and a matching If-None-Match is answered without touching the DB.
+    """
+    qz = await get_quiz_snapshot(session, quiz_id)
     if not qz:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quiz not found")
-    return qz
+
+    etag = make_etag("quiz", qz.id, qz.created_at, qz.updated_at)
+    if is_not_modified(request, etag):
+        return not_modified(etag, SHARED_REVALIDATE)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = SHARED_REVALIDATE
+    return respond(QuizDetailsSchema, qz, response)
 
 
 # Delete quiz
@@ -307,56 +390,97 @@ async def delete_quiz(quiz_id: str, session: AsyncSession = Depends(get_async_se
 
     await session.delete(qz)
     await session.commit()
+    snapshot_cache.invalidate(quiz_id)
+    await invalidate_quiz(quiz_id)
     return {"detail": "Quiz deleted"}
 
-@app.post("/quizzes/{quiz_id}/start")
+# Aggregates over completed sessions, from the rollup maintained on submit
+@app.get("/quizzes/{quiz_id}/stats", response_model=QuizStatsSchema)
+async def get_quiz_stats_summary(quiz_id: str, session: AsyncSession = Depends(get_read_session)):
+    """Attempts, pass rate, average score and time: one primary-key lookup, no scan of quiz_sessions"""
+    row = await get_quiz_stats(session, quiz_id)
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quiz not found")
+
+    attempts = row.attempts or 0
+    return respond(QuizStatsSchema, {
+        "quiz_id": row.quiz_id,
+        "attempts": attempts,
+        "passed": row.passed or 0,
+        "pass_rate": row.passed / attempts if attempts else None,
+        "average_score": row.score_total / attempts if attempts else None,
+        "average_score_percentage": (
+            row.score_total / attempts / row.question_count * 100 if attempts and row.question_count else None
+        ),
+        "average_time_taken_seconds": row.time_taken_seconds_total / attempts if attempts else None,
+        "updated_at": row.updated_at,
+    })
+
+
+# Best completed sessions of a quiz
+@app.get("/quizzes/{quiz_id}/leaderboard", response_model=QuizLeaderboard)
+async def get_quiz_leaderboard(
+    quiz_id: str,
+    limit: int = Query(10, ge=1, le=100),
+    session: AsyncSession = Depends(get_read_session)
+):
+    """Top `limit` sessions by score, then time taken; read straight off the leaderboard index"""
+    rows = await get_leaderboard(session, quiz_id, limit)
+    if not rows and await get_quiz_stats(session, quiz_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quiz not found")
+
+    entries = [
+        {
+            "rank": rank,
+            "session_id": row.id,
+            "user_id": row.user_id,
+            "attempt_number": row.attempt_number,
+            "score": row.score,
+            "score_percentage": row.score / row.question_count * 100 if row.question_count else 0.0,
+            "time_taken_seconds": int((row.completed_at - row.started_at).total_seconds()),
+            "completed_at": row.completed_at,
+            "completion_details": row.completion_details,
+        }
+        for rank, row in enumerate(rows, start=1)
+    ]
+    return respond(QuizLeaderboard, {"quiz_id": quiz_id, "entries": entries})
+
+@app.post("/quizzes/{quiz_id}/start", response_model=QuizSessionSchema)
 async def start_quiz_session(
     quiz_id: str,
     current_user: str = Depends(get_current_user),
     session : AsyncSession = Depends(get_async_session)
 ):
-    result = await session.execute(
-        select(QuizORM).where(QuizORM.id == quiz_id)
-    )
-    quiz = result.scalar_one_or_none()
-    # quiz = session.query(QuizORM).filter(QuizORM.id == quiz_id).first()
-    
-    # Count user's previous attempts for this quiz
-    result = await session.scalar(
-        select(func.count(QuizSessionORM.id)).where(
-            QuizSessionORM.quiz_id == quiz_id,
-            QuizSessionORM.user_id == current_user
-        )
+    # Quiz settings never change after creation: read them from the snapshot cache
+    quiz = await get_quiz_snapshot(session, quiz_id)
+    if not quiz:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quiz not found")
+
+    # Reserve the next attempt number (enforcing the limit) and create the session atomically
+    qs = await start_attempt(
+        session,
+        quiz_id=quiz_id,
+        user_id=current_user,
+        question_count=quiz.question_count,
+        time_limit_seconds=quiz.time_limit_seconds,
+        max_attempts=quiz.number_of_attempts,
     )
-    previous_attempts = result or 0
-    
-    # Check if user exceeded max attempts
-    if quiz.number_of_attempts is not None and quiz.number_of_attempts !=0 and previous_attempts >= quiz.number_of_attempts:
+    if qs is None:
         raise HTTPException(
             status_code=403,
             detail=f"Maximum attempts ({quiz.number_of_attempts}) reached for this quiz"
         )
-    
-    # Create new session
-    qs = QuizSessionORM(
-        quiz_id=quiz_id,
-        user_id=current_user,
-        attempt_number=previous_attempts + 1,  # Store which attempt this is
-        question_count=quiz.question_count,
-        time_limit_seconds=quiz.time_limit_seconds
-    )
-    
-    session.add(qs)
+
     await session.commit()
-    await session.refresh(qs)
+    await invalidate_session_lists(current_user)
     
     return qs
 
 #get quiz sessions
-@app.get("/sessions/", response_model=list[QuizSessionSchema])
+@app.get("/sessions/", response_model=Page[QuizSessionSchema])
 async def list_quiz_sessions(
     filters: QuizSessionFilter = Depends(),
-    session: AsyncSession = Depends(get_async_session)
+    session: AsyncSession = Depends(get_read_session)
 ):
     query = select(QuizSessionORM)
 
@@ -367,17 +491,128 @@ async def list_quiz_sessions(
     if filters.is_active is not None:
         query = query.where(QuizSessionORM.is_active == filters.is_active)
 
-    result = await session.scalars(query)
-    return result.all()
+    cache_key = await session_list_key(filters.model_dump())
+    cached = await cache.get(cache_key) if cache_key else None
+    if cached is not None:
+        return respond(None, cached)
+
+    order = (QuizSessionORM.started_at, QuizSessionORM.id)
+    result = await session.scalars(paginate(query, order, filters.cursor, filters.limit))
+    qsessions, next_cursor = build_page(result.all(), order, filters.limit)
+
+    page = Page[QuizSessionSchema].model_validate(
+        {"items": qsessions, "next_cursor": next_cursor}, from_attributes=True
+    ).model_dump(mode="json")
+    if cache_key:
+        await cache.set(cache_key, page, ttl=SESSION_LIST_TTL)
+    return respond(None, page)
+
+# A user's history and totals, from the rollups maintained on submit
+@app.get("/users/{user_id}/progress", response_model=UserProgress)
+async def get_user_progress(
+    user_id: str,
+    filters: UserProgressFilter = Depends(),
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Totals, per-topic mastery and one page of per-quiz progress (best and
+    last score), most recently completed first.
+
+    Reads one row per topic and `limit` + 1 rows per page, however many
+    attempts the user has made; no session or answer rows are touched.
+    """
+    topics = await get_user_topic_mastery(session, user_id)
+
+    order = (UserQuizProgressORM.last_completed_at, UserQuizProgressORM.quiz_id)
+    query = select(UserQuizProgressORM).where(UserQuizProgressORM.user_id == user_id)
+    result = await session.scalars(paginate(query, order, filters.cursor, filters.limit, descending=True))
+    quizzes, next_cursor = build_page(result.all(), order, filters.limit)
+
+    def ratio(part, whole):
+        return part / whole if whole else None
+
+    questions_total = sum(t.questions_total for t in topics)
+    correct_total = sum(t.correct_total for t in topics)
+    return respond(UserProgress, {
+        "user_id": user_id,
+        "attempts": sum(t.attempts for t in topics),
+        "passed": sum(t.passed for t in topics),
+        "questions_total": questions_total,
+        "correct_total": correct_total,
+        "mastery": ratio(correct_total, questions_total),
+        "topics": [
+            {**t._mapping, "mastery": ratio(t.correct_total, t.questions_total)}
+            for t in topics
+        ],
+        "quizzes": [
+            {
+                "quiz_id": q.quiz_id,
+                "quiz_name": q.quiz_name,
+                "topic_id": q.topic_id,
+                "question_count": q.question_count,
+                "attempts": q.attempts,
+                "passed": q.passed,
+                "best_score": q.best_score,
+                "best_score_percentage": (ratio(q.best_score, q.question_count) or 0.0) * 100,
+                "last_score": q.last_score,
+                "last_score_percentage": (ratio(q.last_score, q.question_count) or 0.0) * 100,
+                "last_session_id": q.last_session_id,
+                "last_completed_at": q.last_completed_at,
+            }
+            for q in quizzes
+        ],
+        "next_cursor": next_cursor,
+    })
 
 #get quiz session details
 @app.get("/sessions/{session_id}", response_model=QuizSessionDetails)
 async def get_quiz_session(qsession: QuizSessionORM = Depends(get_quiz_session)):
-    return qsession
+    return respond(QuizSessionDetails, qsession)
+
+# Whole question set and current answers of a session in one call
+@app.get("/sessions/{session_id}/bootstrap", response_model=QuizSessionBootstrap)
+async def get_quiz_session_bootstrap(
+    request: Request,
+    response: Response,
+    qsession: QuizSessionORM = Depends(get_quiz_session_summary),
+    db: AsyncSession = Depends(get_async_session)
+):
+    """
+    Return the session, all of its questions (client-safe, in order) and the
+    answers given so far, so clients do not poll questions/next per question.
+
+    Questions come from the snapshot cache. The strong ETag covers the
+    session state and answers; a submitted session never changes again and
+    is marked immutable.
+    """
+    result = await db.execute(
+        select(AnswerORM).where(AnswerORM.quiz_session_id == qsession.id)
+    )
+    answers = result.scalars().all()
+
+    etag = make_etag(
+        qsession.id, qsession.question_progress_index, qsession.is_active, qsession.completed_at,
+        *sorted((a.id, a.selected_option, a.revision_count, a.is_correct) for a in answers),
+    )
+    cache_control = REVALIDATE if qsession.is_active else IMMUTABLE
+    if is_not_modified(request, etag):
+        return not_modified(etag, cache_control)
+
+    snapshot = await get_quiz_snapshot(db, qsession.quiz_id)
+    if not snapshot:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Quiz not found")
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return respond(
+        QuizSessionBootstrap,
+        {"session": qsession, "questions": snapshot.questions, "answers": answers},
+        response,
+    )
 
 #get submitted quiz session stats
 @app.get("/sessions/{session_id}/stats", response_model=QuizSummary)
-async def get_quiz_session_stats( qsession: QuizSessionORM = Depends(get_quiz_session_summary)):
+async def get_quiz_session_stats( qsession: QuizSessionORM = Depends(get_quiz_session_with_quiz)):
     if qsession.is_active:
         raise HTTPException(
             status_code=400,
@@ -393,152 +628,167 @@ async def delete_quiz_session(
     db: AsyncSession = Depends(get_async_session)
 ):
     """Delete a quiz session - useful for testing"""
+    if not qsession.is_active:
+        await remove_completed_sessions(db, [qsession.id])
     await db.delete(qsession)
     await db.commit()
+    await invalidate_session_lists(qsession.user_id)
     return {"detail": "Quiz session deleted"}
 
 
 # Get next quiz question
 @app.get("/sessions/{session_id}/questions/next", response_model=QuestionForClient)
 async def get_next_question(
-    qsession: QuizSessionORM = Depends(get_active_quiz_session),
+    qsession: QuizSessionORM = Depends(get_active_quiz_session_summary),
     db: AsyncSession = Depends(get_async_session)
 ):
     
     if qsession.question_progress_index == qsession.question_count:
         raise HTTPException(status_code=204, detail="No more questions.")
     
-    result = await db.execute(
-        select(QuizQuestionORM).filter(
-            QuizQuestionORM.quiz_id == qsession.quiz_id,
-            QuizQuestionORM.order_index == qsession.question_progress_index
-        )
-    )
-    q = result.scalar_one_or_none()
+    snapshot = await get_quiz_snapshot(db, qsession.quiz_id)
+    q = snapshot.question_at(qsession.question_progress_index) if snapshot else None
     
     if not q:
         raise HTTPException(status_code=404, detail=f"Failed to accure question index: {qsession.question_progress_index}")
     
-    return q
+    return respond(QuestionForClient, q)
 
 # Get quiz question by ID
 @app.get("/quiz-questions/{question_id}", response_model=QuestionForClient)
-async def get_question(question_id: str, session: AsyncSession = Depends(get_async_session)):
-    q = await session.get(QuizQuestionORM, question_id)
+async def get_question(
+    question_id: str,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Quiz questions are immutable snapshots: ETag from the cached quiz, 304 without DB on a cache hit"""
+    quiz_id = snapshot_cache.quiz_id_for_question(question_id)
+    if quiz_id is None:
+        quiz_id = await session.scalar(
+            select(QuizQuestionORM.quiz_id).where(QuizQuestionORM.id == question_id)
+        )
+    snapshot = await get_quiz_snapshot(session, quiz_id) if quiz_id else None
+    q = snapshot.question_by_id(question_id) if snapshot else None
     if not q:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Question not found")
-    return q
+
+    etag = make_etag("quiz-question", q.id, snapshot.created_at)
+    if is_not_modified(request, etag):
+        return not_modified(etag, SHARED_REVALIDATE)
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = SHARED_REVALIDATE
+    return respond(QuestionForClient, q, response)
 
 # User can update their answer while quiz is not submitted
-@app.put("/sessions/{session_id}/answers/{question_id}")
+@app.put("/sessions/{session_id}/answers/{question_id}", response_model=AnswerSchema)
 async def update_answer(
     session_id: str,
     question_id: str,
     new_answer: AnswerSubmitRequest,
-    qsession: QuizSessionORM = Depends(get_active_quiz_session),
+    qsession: QuizSessionORM = Depends(get_active_quiz_session_summary),
     session : AsyncSession = Depends(get_async_session)
 ):
+    # Upsert the answer and advance progress atomically (one statement)
+    answer = await save_answer(
+        session, session_id, qsession.user_id, question_id, new_answer.selected_option
+    )
+    if answer is None:
+        raise HTTPException(status_code=400, detail="Quiz session inactive, already submitted or past its time limit")
 
+    await session.commit()
+    await invalidate_session_lists(qsession.user_id)
+
+    return respond(AnswerSchema, answer)
+
+# Save many answers at once (offline clients, bulk graders)
+@app.put("/sessions/{session_id}/answers", response_model=List[AnswerSchema])
+async def update_answers(
+    session_id: str,
+    batch: AnswerBatchRequest,
+    qsession: QuizSessionORM = Depends(get_active_quiz_session_summary),
+    session : AsyncSession = Depends(get_async_session)
+):
+    """
+    Upsert a batch of answers in one statement.
 
-    result = await session.execute(
-        select(AnswerORM).filter(
-        AnswerORM.quiz_session_id == session_id,
-        AnswerORM.quiz_question_id == question_id
+    The session is validated once, all answers are written together and
+    progress is advanced once by the number of distinct questions answered.
+    """
+    snapshot = await get_quiz_snapshot(session, qsession.quiz_id)
+    quiz_question_ids = {q.id for q in snapshot.questions} if snapshot else set()
+    unknown = sorted({a.question_id for a in batch.answers} - quiz_question_ids)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"message": "Questions do not belong to this quiz", "question_ids": unknown}
         )
+
+    answers = await save_answers(
+        session, session_id, qsession.user_id,
+        [(a.question_id, a.selected_option) for a in batch.answers],
     )
-    answer = result.scalar_one_or_none()
-
-    # Update or create answer
-    if answer:
-        answer.selected_option = new_answer.selected_option
-        answer.revision_count += 1
-        answer.updated_at = datetime.utcnow()
-    else:
-        answer = AnswerORM(
-            quiz_session_id=session_id,
-            quiz_question_id=question_id,
-            selected_option=new_answer.selected_option,
-            revision_count=0
-        )
-        session.add(answer)
-    
-    if qsession.question_progress_index < qsession.question_count:
-        qsession.question_progress_index += 1
-    
-    # Commit all changes
+    if not answers:
+        raise HTTPException(status_code=400, detail="Quiz session inactive, already submitted or past its time limit")
+
     await session.commit()
-    await session.refresh(answer)
+    await invalidate_session_lists(qsession.user_id)
 
-    return answer
+    return answers
+
+def timed_out_summary(qsession: QuizSessionORM) -> QuizSessionORM:
+    """
+    A closed session submitted (again): the expiry sweep may have graded it
+    before the client's submit got through, and that client still wants its
+    result. Sessions the user submitted themselves stay a 400.
+    """
+    if qsession.completion_details != "timeout":
+        raise HTTPException(status_code=400, detail="Quiz session inactive or already submitted")
+    return qsession
 
 @app.post("/sessions/{session_id}/submit", response_model=QuizSummary)
 async def submit_quiz(
-    qsession: QuizSessionORM = Depends(get_active_quiz_session),
+    qsession: QuizSessionORM = Depends(get_quiz_session_with_quiz),
     db: AsyncSession = Depends(get_async_session)
 ):
-    
-    # Get all questions for this quiz
-    result = await db.execute(
-        select(QuizQuestionORM).where(
-            QuizQuestionORM.quiz_id == qsession.quiz_id
-        ).order_by(QuizQuestionORM.order_index)
-    )
-    questions = result.scalars().all()
-    
-    # Get all answers for this session
-    result = await db.execute(
-        select(AnswerORM).where(
-            AnswerORM.quiz_session_id == qsession.id,
-            AnswerORM.attempt_number == 1  # Exam-style, only attempt 1
-        )
-    )
-    answers = result.scalars().all()
-    
-    # Create a map of question_id -> answer for quick lookup
-    answer_map = {answer.quiz_question_id: answer for answer in answers}
-    
-    # Grade all answers
-    correct_count = 0
-    wrong_count = 0
-    unanswered_count = 0
-    
-    for question in questions:
-        answer = answer_map.get(question.id)
-        
-        if answer:
-            # Check if answer is correct
-            is_correct = (answer.selected_option == question.correct_option)
-            
-            # Update answer with correctness
-            answer.is_correct = is_correct
-            answer.graded_at = datetime.utcnow()
-            
-            if is_correct:
-                correct_count += 1
-            else:
-                wrong_count += 1
-        else:
-            # Question not answered
-            unanswered_count += 1
-    
-    # Update quiz session
-    qsession.score = correct_count
-    qsession.wrong_answers = wrong_count
-    qsession.unanswered_questions = unanswered_count
-    qsession.is_active = False
-    qsession.completed_at = datetime.utcnow()
-    qsession.completion_details = "completed"
-    
+    if not qsession.is_active:
+        return timed_out_summary(qsession)
+
+    # Grade all answers and close the session in the database (set-based)
+    graded = await grade_sessions(db, [qsession.id])
+    if not graded:
+        # Closed since it was loaded: submitted concurrently, or by the expiry sweep
+        await db.refresh(qsession)
+        return timed_out_summary(qsession)
+
+    # Quiz stats and user progress rollups move with the session, in the same transaction
+    await add_completed_sessions(db, [qsession.id])
+
     # Commit all changes
     await db.commit()
-    await db.refresh(qsession)
+
+    # Reflect the new state on the loaded session without another UPDATE
+    for key, value in graded[0]._mapping.items():
+        set_committed_value(qsession, key, value)
+    await invalidate_session_lists(qsession.user_id)
 
     return qsession
     
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters and size of the in-process quiz snapshot cache"""
+    return {"quiz_snapshots": snapshot_cache.stats()}
+
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics: route latencies, in-flight requests, DB pool, question-service calls and session expiry"""
+    return metrics_response()
+
 @app.post("/reset-data")
 async def reset_data(secret: str):
     if secret != "supersecret":
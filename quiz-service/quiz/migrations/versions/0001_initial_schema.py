@@ -0,0 +1,94 @@
+"""initial schema
+
+Matches the tables previously created by Base.metadata.create_all. For a
+database that already has them, run `alembic stamp 0001` once instead of
+upgrading through this revision.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "quizzes",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("topic_id", sa.String(), nullable=False),
+        sa.Column("topic_name", sa.String(), nullable=False),
+        sa.Column("question_count", sa.Integer(), nullable=False),
+        sa.Column("passing_ratio", sa.Float(), nullable=False),
+        sa.Column("time_limit_seconds", sa.Integer(), nullable=True),
+        sa.Column("number_of_attempts", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_quizzes_user_id", "quizzes", ["user_id"])
+
+    op.create_table(
+        "quiz_questions",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("quiz_id", sa.String(), sa.ForeignKey("quizzes.id"), nullable=True),
+        sa.Column("question_id", sa.String(), nullable=True),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("question", sa.String(), nullable=True),
+        sa.Column("options", postgresql.JSONB(), nullable=True),
+        sa.Column("correct_option", sa.Integer(), nullable=True),
+        sa.Column("explanation", sa.Text(), nullable=True),
+        sa.Column("order_index", sa.Integer(), nullable=True),
+    )
+
+    op.create_table(
+        "quiz_sessions",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("quiz_id", sa.String(), sa.ForeignKey("quizzes.id", ondelete="RESTRICT"), nullable=True),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("question_count", sa.Integer(), nullable=False),
+        sa.Column("time_limit_seconds", sa.Integer(), nullable=True),
+        sa.Column("attempt_number", sa.Integer(), nullable=False),
+        sa.Column("question_progress_index", sa.Integer(), nullable=False),
+        sa.Column("score", sa.Integer(), nullable=True),
+        sa.Column("wrong_answers", sa.Integer(), nullable=True),
+        sa.Column("unanswered_questions", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("completion_details", sa.String(), nullable=True),
+    )
+
+    op.create_table(
+        "answers",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("quiz_session_id", sa.String(), sa.ForeignKey("quiz_sessions.id"), nullable=True),
+        sa.Column("quiz_question_id", sa.String(), sa.ForeignKey("quiz_questions.id"), nullable=True),
+        sa.Column("selected_option", sa.Integer(), nullable=False),
+        sa.Column("is_correct", sa.Boolean(), nullable=True),
+        sa.Column("answered_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("submitted_at", sa.DateTime(), nullable=True),
+        sa.Column("revision_count", sa.Integer(), nullable=True),
+        sa.Column("attempt_number", sa.Integer(), nullable=True),
+        sa.UniqueConstraint("quiz_session_id", "quiz_question_id", "attempt_number"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("answers")
+    op.drop_table("quiz_sessions")
+    op.drop_table("quiz_questions")
+    op.drop_index("ix_quizzes_user_id", table_name="quizzes")
+    op.drop_table("quizzes")
@@ -0,0 +1,64 @@
+"""hot path indexes
+
+Indexes for the lookups done on every request:
+- quiz_questions (quiz_id, order_index): next-question lookup, unique per quiz
+- quiz_sessions (quiz_id, user_id): attempt counting when a session starts
+- quiz_sessions (user_id, started_at, id) WHERE is_active: a user's open
+  sessions, in keyset-pagination order
+- quizzes / quiz_sessions keyset pagination order
+
+answers (quiz_session_id, quiz_question_id) is already served by the leading
+columns of the existing unique constraint on
+(quiz_session_id, quiz_question_id, attempt_number).
+
+Indexes are built CONCURRENTLY so upgrading a live database does not block
+writes.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16 09:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_quiz_questions_quiz_id_order_index", "quiz_questions", ["quiz_id", "order_index"],
+            unique=True, postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_quiz_sessions_quiz_id_user_id", "quiz_sessions", ["quiz_id", "user_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_quiz_sessions_active_user_id", "quiz_sessions", ["user_id", "started_at", "id"],
+            postgresql_where=sa.text("is_active"), postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_quizzes_created_at_id", "quizzes", ["created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_quiz_sessions_started_at_id", "quiz_sessions", ["started_at", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_quiz_sessions_started_at_id", table_name="quiz_sessions", postgresql_concurrently=True)
+        op.drop_index("ix_quizzes_created_at_id", table_name="quizzes", postgresql_concurrently=True)
+        op.drop_index("ix_quiz_sessions_active_user_id", table_name="quiz_sessions", postgresql_concurrently=True)
+        op.drop_index("ix_quiz_sessions_quiz_id_user_id", table_name="quiz_sessions", postgresql_concurrently=True)
+        op.drop_index("ix_quiz_questions_quiz_id_order_index", table_name="quiz_questions", postgresql_concurrently=True)
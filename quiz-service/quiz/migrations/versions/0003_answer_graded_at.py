@@ -0,0 +1,28 @@
+"""answers.graded_at
+
+submit_quiz always set graded_at on answers, but the column did not exist,
+so the value was never stored.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("answers", sa.Column("graded_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("answers", "graded_at")
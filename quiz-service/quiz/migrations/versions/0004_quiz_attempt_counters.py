@@ -0,0 +1,42 @@
+"""quiz_attempt_counters
+
+Per-(quiz, user) attempt counter used by start_quiz_session instead of
+counting quiz_sessions. Backfilled with the highest attempt_number seen.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "quiz_attempt_counters",
+        sa.Column("quiz_id", sa.String(), sa.ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("user_id", sa.String(), primary_key=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+    )
+    op.execute(
+        """
+        INSERT INTO quiz_attempt_counters (quiz_id, user_id, attempts)
+        SELECT quiz_id, user_id, max(attempt_number)
+        FROM quiz_sessions
+        WHERE quiz_id IS NOT NULL
+        GROUP BY quiz_id, user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("quiz_attempt_counters")
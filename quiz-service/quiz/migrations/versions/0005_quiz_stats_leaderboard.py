@@ -0,0 +1,66 @@
+"""quiz_stats rollup and leaderboard index
+
+- quiz_stats: running totals of completed sessions per quiz (attempts,
+  passed, score and time taken), updated by submit in the same
+  transaction. Backfilled from the completed sessions.
+- quiz_sessions (quiz_id, score DESC, completed_at - started_at,
+  completed_at, id) WHERE NOT is_active: leaderboard order, so the top N
+  is read from the index without sorting. Built CONCURRENTLY.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "quiz_stats",
+        sa.Column("quiz_id", sa.String(), sa.ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("passed", sa.Integer(), nullable=False),
+        sa.Column("score_total", sa.BigInteger(), nullable=False),
+        sa.Column("time_taken_seconds_total", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.execute(
+        """
+        INSERT INTO quiz_stats (quiz_id, attempts, passed, score_total, time_taken_seconds_total, updated_at)
+        SELECT s.quiz_id,
+               count(*),
+               count(*) FILTER (
+                   WHERE s.question_count > 0
+                     AND s.score::float8 / s.question_count * 100 > q.passing_ratio * 100
+               ),
+               coalesce(sum(s.score), 0),
+               coalesce(sum(floor(extract(epoch FROM s.completed_at - s.started_at))::bigint), 0),
+               max(s.completed_at)
+        FROM quiz_sessions s
+        JOIN quizzes q ON q.id = s.quiz_id
+        WHERE NOT s.is_active
+        GROUP BY s.quiz_id
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_quiz_sessions_leaderboard", "quiz_sessions",
+            ["quiz_id", sa.text("score DESC"), sa.text("(completed_at - started_at)"), "completed_at", "id"],
+            postgresql_where=sa.text("NOT is_active"), postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_quiz_sessions_leaderboard", table_name="quiz_sessions", postgresql_concurrently=True)
+    op.drop_table("quiz_stats")
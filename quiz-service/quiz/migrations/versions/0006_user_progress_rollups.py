@@ -0,0 +1,100 @@
+"""user progress rollups
+
+- user_quiz_progress: per (user, quiz) attempts, passes, best and last
+  score, with the quiz name / topic denormalized; indexed by
+  (user_id, last_completed_at, quiz_id) for history pages.
+- user_topic_mastery: per (user, topic) attempts, passes, questions seen
+  and answered correctly.
+
+Both are maintained by submit in the same transaction and backfilled here
+from the completed sessions.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 16:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PASSED = "s.question_count > 0 AND s.score::float8 / s.question_count * 100 > q.passing_ratio * 100"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_quiz_progress",
+        sa.Column("user_id", sa.String(), primary_key=True),
+        sa.Column("quiz_id", sa.String(), sa.ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("quiz_name", sa.String(), nullable=False),
+        sa.Column("topic_id", sa.String(), nullable=False),
+        sa.Column("question_count", sa.Integer(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("passed", sa.Integer(), nullable=False),
+        sa.Column("best_score", sa.Integer(), nullable=False),
+        sa.Column("last_score", sa.Integer(), nullable=False),
+        sa.Column("last_session_id", sa.String(), nullable=False),
+        sa.Column("last_completed_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_user_quiz_progress_user_id_last_completed_at", "user_quiz_progress",
+        ["user_id", "last_completed_at", "quiz_id"],
+    )
+    op.create_table(
+        "user_topic_mastery",
+        sa.Column("user_id", sa.String(), primary_key=True),
+        sa.Column("topic_id", sa.String(), primary_key=True),
+        sa.Column("topic_name", sa.String(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("passed", sa.Integer(), nullable=False),
+        sa.Column("questions_total", sa.BigInteger(), nullable=False),
+        sa.Column("correct_total", sa.BigInteger(), nullable=False),
+        sa.Column("last_completed_at", sa.DateTime(), nullable=True),
+    )
+
+    op.execute(
+        f"""
+        INSERT INTO user_quiz_progress (user_id, quiz_id, quiz_name, topic_id, question_count, attempts, passed,
+                                        best_score, last_score, last_session_id, last_completed_at)
+        SELECT s.user_id, q.id, q.name, q.topic_id, q.question_count,
+               count(*),
+               count(*) FILTER (WHERE {PASSED}),
+               max(s.score),
+               (array_agg(s.score ORDER BY s.completed_at DESC, s.id DESC))[1],
+               (array_agg(s.id ORDER BY s.completed_at DESC, s.id DESC))[1],
+               max(s.completed_at)
+        FROM quiz_sessions s
+        JOIN quizzes q ON q.id = s.quiz_id
+        WHERE NOT s.is_active AND s.completed_at IS NOT NULL
+        GROUP BY s.user_id, q.id
+        """
+    )
+    op.execute(
+        f"""
+        INSERT INTO user_topic_mastery (user_id, topic_id, topic_name, attempts, passed, questions_total,
+                                        correct_total, last_completed_at)
+        SELECT s.user_id, q.topic_id, max(q.topic_name),
+               count(*),
+               count(*) FILTER (WHERE {PASSED}),
+               coalesce(sum(s.question_count), 0),
+               coalesce(sum(s.score), 0),
+               max(s.completed_at)
+        FROM quiz_sessions s
+        JOIN quizzes q ON q.id = s.quiz_id
+        WHERE NOT s.is_active
+        GROUP BY s.user_id, q.topic_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_topic_mastery")
+    op.drop_index("ix_user_quiz_progress_user_id_last_completed_at", table_name="user_quiz_progress")
+    op.drop_table("user_quiz_progress")
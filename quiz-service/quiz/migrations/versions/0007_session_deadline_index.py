@@ -0,0 +1,37 @@
+"""active session deadline index
+
+quiz_sessions (started_at + time_limit_seconds * interval '1 second')
+WHERE is_active AND time_limit_seconds IS NOT NULL: lets the expiry sweep
+find timed-out sessions without scanning the active ones. Built
+CONCURRENTLY.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_quiz_sessions_active_deadline", "quiz_sessions",
+            [sa.text("(started_at + time_limit_seconds * interval '1 second')")],
+            postgresql_where=sa.text("is_active AND time_limit_seconds IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_quiz_sessions_active_deadline", table_name="quiz_sessions", postgresql_concurrently=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, Boolean, Null, UniqueConstraint
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Text, Float, Boolean, Null, UniqueConstraint, Index, Interval, text, literal_column
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
@@ -31,6 +31,9 @@ class Quiz(Base):
     questions = relationship("QuizQuestion", back_populates="quiz", cascade="all, delete-orphan")
     sessions = relationship("QuizSession", back_populates="quiz")
 
+    # Keyset pagination order for GET /quizzes/
+    __table_args__ = ( Index("ix_quizzes_created_at_id", "created_at", "id"), )
+
 class QuizQuestion(Base):
     __tablename__ = "quiz_questions"
     
@@ -50,6 +53,9 @@ class QuizQuestion(Base):
     #Relationships
     quiz = relationship("Quiz", back_populates="questions")
 
+    # Next-question lookup by position in the quiz
+    __table_args__ = ( Index("ix_quiz_questions_quiz_id_order_index", "quiz_id", "order_index", unique=True), )
+
 class QuizSession(Base):
     __tablename__ = "quiz_sessions"
 
@@ -78,6 +84,15 @@ class QuizSession(Base):
     quiz = relationship("Quiz", back_populates="sessions")
     answers = relationship("Answer", back_populates="quiz_session")
 
+    __table_args__ = (
+        # Keyset pagination order for GET /sessions/
+        Index("ix_quiz_sessions_started_at_id", "started_at", "id"),
+        # Attempt counting when a session starts
+        Index("ix_quiz_sessions_quiz_id_user_id", "quiz_id", "user_id"),
+        # A user's open sessions only
+        Index("ix_quiz_sessions_active_user_id", "user_id", "started_at", "id", postgresql_where=text("is_active")),
+    )
+
     # Computed
     @property
     def time_taken_seconds(self):
@@ -97,6 +112,79 @@ class QuizSession(Base):
             return self.score_percentage > (self.quiz.passing_ratio * 100)
         return False
 
+# Leaderboard order of a quiz's completed sessions: best score, then fastest, then earliest
+Index(
+    "ix_quiz_sessions_leaderboard",
+    QuizSession.quiz_id,
+    QuizSession.score.desc(),
+    QuizSession.completed_at - QuizSession.started_at,
+    QuizSession.completed_at,
+    QuizSession.id,
+    postgresql_where=text("NOT is_active"),
+)
+
+# Active timed sessions by deadline, for the expiry sweep (same expression as database/grading.py)
+Index(
+    "ix_quiz_sessions_active_deadline",
+    QuizSession.started_at + QuizSession.time_limit_seconds * literal_column("interval '1 second'", Interval),
+    postgresql_where=text("is_active AND time_limit_seconds IS NOT NULL"),
+)
+
+class QuizAttemptCounter(Base):
+    """Attempts started per (quiz, user); reserved atomically when a session starts"""
+    __tablename__ = "quiz_attempt_counters"
+
+    quiz_id = Column(String, ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(String, primary_key=True)
+    attempts = Column(Integer, nullable=False, default=0)
+
+class QuizStats(Base):
+    """Running totals over a quiz's completed sessions; maintained on submit (database/rollups.py)"""
+    __tablename__ = "quiz_stats"
+
+    quiz_id = Column(String, ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    passed = Column(Integer, nullable=False, default=0)
+    score_total = Column(BigInteger, nullable=False, default=0)
+    time_taken_seconds_total = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=True)
+
+class UserQuizProgress(Base):
+    """A user's completed attempts of one quiz: counts, best and last score; maintained on submit"""
+    __tablename__ = "user_quiz_progress"
+
+    user_id = Column(String, primary_key=True)
+    quiz_id = Column(String, ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True)
+
+    # Denormalized from the (immutable) quiz so history pages read one table
+    quiz_name = Column(String, nullable=False)
+    topic_id = Column(String, nullable=False)
+    question_count = Column(Integer, nullable=False)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    passed = Column(Integer, nullable=False, default=0)
+    best_score = Column(Integer, nullable=False, default=0)
+    last_score = Column(Integer, nullable=False, default=0)
+    last_session_id = Column(String, nullable=False)
+    last_completed_at = Column(DateTime, nullable=False)
+
+    # Keyset pagination order for GET /users/{user_id}/progress (most recent first)
+    __table_args__ = ( Index("ix_user_quiz_progress_user_id_last_completed_at", "user_id", "last_completed_at", "quiz_id"), )
+
+class UserTopicMastery(Base):
+    """A user's completed attempts per topic: questions seen and answered correctly; maintained on submit"""
+    __tablename__ = "user_topic_mastery"
+
+    user_id = Column(String, primary_key=True)
+    topic_id = Column(String, primary_key=True)
+    topic_name = Column(String, nullable=False)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    passed = Column(Integer, nullable=False, default=0)
+    questions_total = Column(BigInteger, nullable=False, default=0)
+    correct_total = Column(BigInteger, nullable=False, default=0)
+    last_completed_at = Column(DateTime, nullable=True)
+
 class Answer(Base):
     __tablename__ = "answers"
     
@@ -110,6 +198,7 @@ class Answer(Base):
     answered_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, onupdate=datetime.utcnow)
     submitted_at = Column(DateTime, onupdate=datetime.utcnow)
+    graded_at = Column(DateTime, nullable=True)
     revision_count = Column(Integer, default=0) # Times answer changed before quiz submission (tracker field)
     attempt_number = Column(Integer, default=1) # Times answer resubmitted (for interactive sessions - unique per attempt field)
     
@@ -118,4 +207,5 @@ class Answer(Base):
     quiz_question = relationship("QuizQuestion")
 
     # Can't have two answers in a session with the same attempt number
+    # (its index also serves lookups by (quiz_session_id, quiz_question_id))
     __table_args__ = ( UniqueConstraint('quiz_session_id', 'quiz_question_id', 'attempt_number'), )
\ No newline at end of file
@@ -0,0 +1,128 @@
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Statements slower than this are logged with their parameters
+SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "200"))
+# A SELECT shape run this many times in one request is reported as a likely N+1
+REPEATED_QUERY_THRESHOLD = int(os.getenv("SQL_REPEATED_QUERY_THRESHOLD", "5"))
+# Debug mode: add X-DB-Query-Count / X-DB-Time-Ms to every response
+DEBUG_HEADERS = os.getenv("SQL_DEBUG_HEADERS", "0").lower() in ("1", "true", "yes")
+
+MAX_LOGGED_PARAMS_CHARS = 500
+
+# Lists of bind parameters ($1, $2, ... / %(name)s), each optionally cast as
+# asyncpg renders them ($1::VARCHAR, $2::TIMESTAMP WITHOUT TIME ZONE, $3::INTEGER[]),
+# collapse to one placeholder
+_PARAM = r"(?:\$\d+|%\(\w+\)s|\?)(?:::\w+(?: \w+)*(?:\[\])?)?"
+_PARAM_LIST = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})*\s*\)")
+# ... and so do the rows of a multi-row VALUES once their lists are collapsed
+_ROW_LIST = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RequestSQLStats:
+    """Statements run while handling one request"""
+
+    __slots__ = ("count", "total_ms", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes: Counter = Counter()
+
+    def repeated(self, threshold: int = REPEATED_QUERY_THRESHOLD):
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+_current: ContextVar[Optional[RequestSQLStats]] = ContextVar("request_sql_stats", default=None)
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so runs with different IN-list / VALUES lengths compare equal"""
+    return _ROW_LIST.sub("(?)", _PARAM_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip()))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("sqlstats_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["sqlstats_start"].pop()) * 1000
+
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.total_ms += elapsed_ms
+        # Chunked writes (bulk imports) repeat by design; N+1 shows up as reads
+        if statement.lstrip()[:6].upper() == "SELECT":
+            stats.shapes[statement_shape(statement)] += 1
+
+    if elapsed_ms >= SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms): %s | params: %.*s",
+            elapsed_ms, statement, MAX_LOGGED_PARAMS_CHARS, repr(parameters),
+        )
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute does not run for failed statements: drop their start time
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("sqlstats_start"):
+        conn.info["sqlstats_start"].pop()
+
+
+def track_queries(engine: AsyncEngine):
+    """Time every statement run on `engine`"""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+class SQLStatsMiddleware:
+    """
+    ASGI middleware collecting per-request statement counts and DB time.
+
+    Repeated statement shapes (the same SELECT run once per row, typically a
+    lazy load in a loop) are logged with the route template. With
+    SQL_DEBUG_HEADERS set the totals are returned as X-DB-Query-Count and
+    X-DB-Time-Ms; they cover statements run before the response starts.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSQLStats()
+        token = _current.set(stats)
+
+        async def send_with_headers(message):
+            if DEBUG_HEADERS and message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-time-ms", f"{stats.total_ms:.1f}".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", scope["path"])
+            for shape, n in stats.repeated():
+                logger.warning(
+                    "Possible N+1 in %s %s: statement ran %d times: %s", scope["method"], route, n, shape,
+                )
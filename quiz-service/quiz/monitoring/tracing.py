@@ -0,0 +1,138 @@
+import os
+import sys
+from typing import Optional
+from opentelemetry import propagate, trace
+from opentelemetry.trace import SpanKind, Status, StatusCode
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# "none" (default), "console" (stdout), "file" (TRACING_FILE, one JSON span per line) or "otlp"
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none").lower()
+TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")
+# Statements are attached to DB spans up to this length
+MAX_STATEMENT_CHARS = 2000
+
+# Proxy tracer: a no-op until setup_tracing() installs a provider
+tracer = trace.get_tracer(__name__)
+
+_provider = None
+
+
+def _create_exporter():
+    if TRACING_EXPORTER == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        return ConsoleSpanExporter(out=sys.stdout)
+    if TRACING_EXPORTER == "file":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        return ConsoleSpanExporter(
+            out=open(TRACING_FILE, "a", buffering=1),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+    if TRACING_EXPORTER == "otlp":
+        # Only needed in production; endpoint and headers come from the standard OTEL_EXPORTER_OTLP_* variables
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter()
+    raise ValueError(f"Unknown TRACING_EXPORTER: {TRACING_EXPORTER}")
+
+
+def setup_tracing(service_name: str) -> bool:
+    """Install the tracer provider and exporter; False when tracing is off"""
+    global _provider
+    if TRACING_EXPORTER == "none":
+        return False
+
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    _provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    _provider.add_span_processor(BatchSpanProcessor(_create_exporter()))
+    trace.set_tracer_provider(_provider)
+    return True
+
+
+def shutdown_tracing():
+    """Flush spans still queued in the batch processor"""
+    if _provider is not None:
+        _provider.shutdown()
+
+
+def inject_headers(headers: Optional[dict] = None) -> dict:
+    """Copy of `headers` plus the W3C traceparent of the current span"""
+    carrier = dict(headers or {})
+    propagate.inject(carrier)
+    return carrier
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware opening a server span per request.
+
+    An incoming traceparent header is continued, so a request forwarded by
+    another service ends up in the caller's trace. The span is named after
+    the route template once the route is known.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        carrier = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        with tracer.start_as_current_span(
+            method,
+            context=propagate.extract(carrier),
+            kind=SpanKind.SERVER,
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        ) as span:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route is not None:
+                    span.update_name(f"{method} {route}")
+                    span.set_attribute("http.route", route)
+                span.set_attribute("http.response.status_code", status)
+                if status >= 500:
+                    span.set_status(Status(StatusCode.ERROR))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = tracer.start_span(
+        (statement.split(None, 1) or ["SQL"])[0].upper(),
+        kind=SpanKind.CLIENT,
+        attributes={"db.system": "postgresql", "db.statement": statement[:MAX_STATEMENT_CHARS]},
+    )
+    conn.info.setdefault("tracing_spans", []).append(span)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["tracing_spans"].pop().end()
+
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("tracing_spans"):
+        span = conn.info["tracing_spans"].pop()
+        span.record_exception(exception_context.original_exception)
+        span.set_status(Status(StatusCode.ERROR))
+        span.end()
+
+
+def trace_queries(engine: AsyncEngine):
+    """Record one span per statement run on `engine` (child of the current request span)"""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
@@ -1,8 +1,15 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from typing import Optional, List, Generic, TypeVar
 from datetime import datetime
 import uuid
 
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    """One page of a keyset-paginated list"""
+    items: List[T]
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page; null on the last page")
+
 class QuizRequest(BaseModel):
     name: str = Field(..., example = "History recap")
 
@@ -24,6 +31,10 @@ class QuizFilter(BaseModel):
     min_question_count: Optional[int] = Field(None, ge=1, le=100)
     max_question_count: Optional[int] = Field(None, ge=1, le=100)
 
+    # Pagination
+    cursor: Optional[str] = None
+    limit: int = Field(50, ge=1, le=200)
+
 class AnswerOption(BaseModel):
     num: int
     text: str
@@ -73,6 +84,10 @@ class QuizSessionFilter(BaseModel):
     quiz_id: str | None = Field(None)
     is_active: bool | None = Field(None)
 
+    # Pagination
+    cursor: str | None = Field(None)
+    limit: int = Field(50, ge=1, le=200)
+
 class QuizSession(BaseModel):
     id: str
     quiz_id: str
@@ -101,6 +116,13 @@ class AnswerSubmitRequest(BaseModel):
             }
         }
 
+class AnswerBatchItem(BaseModel):
+    question_id: str = Field(..., description="Quiz question id")
+    selected_option: int = Field(..., ge=0, description="Index of selected option")
+
+class AnswerBatchRequest(BaseModel):
+    answers: List[AnswerBatchItem] = Field(..., min_length=1, max_length=500)
+
 class Answer(BaseModel):
     
     id: str
@@ -113,12 +135,19 @@ class Answer(BaseModel):
     answered_at: datetime
     updated_at: Optional[datetime]
     submitted_at: Optional[datetime]
+    graded_at: Optional[datetime] = None
     revision_count: int
     attempt_number: int
 
 class QuizSessionDetails(QuizSession):
     answers: List[Answer]
 
+# Everything a client needs to run a session, in one response
+class QuizSessionBootstrap(BaseModel):
+    session: QuizSession
+    questions: List[QuestionForClient]
+    answers: List[Answer]
+
 # Response after quiz submission
 class QuizSessionSummary(BaseModel):
     id: str
@@ -148,4 +177,69 @@ class QuestionResultDetail(BaseModel):
 
 # Detailed results including per-question breakdown
 class DetailedQuizResults(QuizSessionSummary):
-    questions: List[QuestionResultDetail]
\ No newline at end of file
+    questions: List[QuestionResultDetail]
+# Aggregates over a quiz's completed sessions (from the quiz_stats rollup)
+class QuizStats(BaseModel):
+    quiz_id: str
+    attempts: int
+    passed: int
+    pass_rate: Optional[float] = Field(None, description="Share of completed sessions that passed; null before the first one")
+    average_score: Optional[float]
+    average_score_percentage: Optional[float]
+    average_time_taken_seconds: Optional[float]
+    updated_at: Optional[datetime]
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    session_id: str
+    user_id: str
+    attempt_number: int
+    score: int
+    score_percentage: float
+    time_taken_seconds: int
+    completed_at: datetime
+    completion_details: Optional[str]
+
+class QuizLeaderboard(BaseModel):
+    quiz_id: str
+    entries: List[LeaderboardEntry]
+
+class UserProgressFilter(BaseModel):
+    # Pagination over the user's quizzes, most recently completed first
+    cursor: str | None = Field(None)
+    limit: int = Field(20, ge=1, le=100)
+
+class TopicMastery(BaseModel):
+    topic_id: str
+    topic_name: str
+    attempts: int
+    passed: int
+    questions_total: int
+    correct_total: int
+    mastery: Optional[float] = Field(None, description="Share of questions answered correctly across completed sessions")
+    last_completed_at: Optional[datetime]
+
+class UserQuizProgress(BaseModel):
+    quiz_id: str
+    quiz_name: str
+    topic_id: str
+    question_count: int
+    attempts: int
+    passed: int
+    best_score: int
+    best_score_percentage: float
+    last_score: int
+    last_score_percentage: float
+    last_session_id: str
+    last_completed_at: datetime
+
+class UserProgress(BaseModel):
+    user_id: str
+    attempts: int
+    passed: int
+    questions_total: int
+    correct_total: int
+    mastery: Optional[float]
+    topics: List[TopicMastery]
+    quizzes: List[UserQuizProgress]
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page of quizzes; null on the last page")
@@ -0,0 +1,100 @@
+"""
+Run the service under uvicorn with a dev or prod profile.
+
+    SERVER_PROFILE=dev  python serve.py   # one process, auto-reload, debug logs
+    SERVER_PROFILE=prod python serve.py   # one worker per available CPU (default)
+
+Settings (environment):
+    HOST, PORT                  bind address (0.0.0.0:8000)
+    WEB_CONCURRENCY             worker processes (prod: available CPUs)
+    ROOT_PATH                   path prefix added by the reverse proxy
+    LOG_LEVEL                   uvicorn log level (dev: debug, prod: info)
+    ACCESS_LOG                  1/0 (dev: on, prod: off)
+    GRACEFUL_SHUTDOWN_TIMEOUT   seconds in-flight requests get after SIGTERM (30)
+    PROMETHEUS_MULTIPROC_DIR    metrics directory shared by workers
+                                (a temporary one is created for >1 worker)
+
+uvloop and httptools are used when installed.
+"""
+import importlib.util
+import math
+import os
+import shutil
+import tempfile
+
+import uvicorn
+
+PROFILES = {
+    "dev": {"workers": 1, "reload": True, "log_level": "debug", "access_log": True},
+    "prod": {"workers": None, "reload": False, "log_level": "info", "access_log": False},
+}
+
+
+def available_cpus() -> int:
+    """CPUs this process may use: affinity mask, capped by a cgroup v2 CPU quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    return default if value is None else value.lower() in ("1", "true", "yes")
+
+
+def prepare_multiprocess_metrics(workers: int):
+    """Workers write metrics to a shared directory that /metrics aggregates; stale files are removed"""
+    if workers <= 1:
+        return
+    directory = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+    else:
+        directory = tempfile.mkdtemp(prefix="prometheus-")
+    # Inherited by the worker processes, read when they import prometheus_client
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = directory
+
+
+def main():
+    profile_name = os.getenv("SERVER_PROFILE", "prod")
+    if profile_name not in PROFILES:
+        raise SystemExit(f"Unknown SERVER_PROFILE: {profile_name} (expected one of {', '.join(PROFILES)})")
+    profile = PROFILES[profile_name]
+
+    workers = 1 if profile["reload"] else int(os.getenv("WEB_CONCURRENCY", profile["workers"] or available_cpus()))
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    prepare_multiprocess_metrics(workers)
+    # Inherited by the workers: per-process caches check it (quiz-service cache/policies.py)
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+
+    print(f"Starting {profile_name} server: {workers} worker(s), loop={loop}, http={http}")
+    uvicorn.run(
+        "main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=workers,
+        reload=profile["reload"],
+        loop=loop,
+        http=http,
+        root_path=os.getenv("ROOT_PATH", ""),
+        log_level=os.getenv("LOG_LEVEL", profile["log_level"]),
+        access_log=env_flag("ACCESS_LOG", profile["access_log"]),
+        proxy_headers=True,
+        forwarded_allow_ips=os.getenv("FORWARDED_ALLOW_IPS", "*"),
+        timeout_graceful_shutdown=int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30")),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from database.quizdb import AsyncSessionLocal
+from database.grading import grade_sessions, lock_expired_sessions
+from database.rollups import add_completed_sessions
+from cache.policies import invalidate_session_lists
+from monitoring.metrics import SESSION_EXPIRY_RUN_DURATION, SESSION_EXPIRY_RUNS, SESSION_EXPIRY_BATCH_SIZE, SESSIONS_EXPIRED
+
+logger = logging.getLogger(__name__)
+
+# Seconds between sweeps (each replica, jittered by ±20%); 0 disables the scheduler
+EXPIRY_INTERVAL_SECONDS = float(os.getenv("SESSION_EXPIRY_INTERVAL_SECONDS", "30"))
+# Sessions graded and closed per transaction
+EXPIRY_BATCH_SIZE = int(os.getenv("SESSION_EXPIRY_BATCH_SIZE", "200"))
+
+
+async def expire_sessions(batch_size: int = EXPIRY_BATCH_SIZE) -> int:
+    """
+    Close every active session past its deadline; returns how many were closed.
+
+    Works in batches of `batch_size`, one transaction each: lock the batch
+    (SKIP LOCKED, so replicas sweeping at the same time split the work),
+    grade and close it with completion_details="timeout" and completed_at at
+    the deadline, and fold it into the rollups. A constant number of
+    statements per batch, whatever its size.
+    """
+    total = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            session_ids = await lock_expired_sessions(db, batch_size)
+            if not session_ids:
+                break
+            closed = await grade_sessions(db, session_ids, completion_details="timeout")
+            await add_completed_sessions(db, [row.id for row in closed])
+            await db.commit()
+
+        SESSION_EXPIRY_BATCH_SIZE.observe(len(closed))
+        SESSIONS_EXPIRED.inc(len(closed))
+        total += len(closed)
+        for user_id in {row.user_id for row in closed}:
+            await invalidate_session_lists(user_id)
+
+        if len(session_ids) < batch_size:
+            break
+    return total
+
+
+async def run_expiry_scheduler(interval: float = EXPIRY_INTERVAL_SECONDS):
+    """Sweep expired sessions every `interval` seconds until cancelled; a failed sweep is logged and retried"""
+    while True:
+        start = time.perf_counter()
+        try:
+            closed = await expire_sessions()
+        except Exception:
+            SESSION_EXPIRY_RUNS.labels("error").inc()
+            logger.exception("Session expiry sweep failed")
+        else:
+            SESSION_EXPIRY_RUNS.labels("ok").inc()
+            if closed:
+                logger.info("Closed %d expired session(s)", closed)
+        SESSION_EXPIRY_RUN_DURATION.observe(time.perf_counter() - start)
+        # Jitter keeps replicas started together from sweeping in lockstep
+        await asyncio.sleep(interval * random.uniform(0.8, 1.2))
@@ -0,0 +1,77 @@
+"""
+Circuit breaker behaviour of the question-service client.
+
+    cd quiz-service/quiz && python -m pytest tests
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from client.questionclient import CircuitBreaker, QuestionServiceClient
+
+
+def make_client(handler, breaker: CircuitBreaker) -> QuestionServiceClient:
+    client = QuestionServiceClient(base_url="http://question-service", max_retries=0, breaker=breaker)
+    client._client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+    return client
+
+
+def open_breaker() -> CircuitBreaker:
+    """A breaker that is open and lets its half-open trial through on the next call"""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    return breaker
+
+
+def test_cancelled_half_open_trial_is_released():
+    async def scenario():
+        started = asyncio.Event()
+
+        async def hang(request):
+            started.set()
+            await asyncio.Event().wait()
+
+        breaker = open_breaker()
+        client = make_client(hang, breaker)
+        trial = asyncio.create_task(client.get_json("/topics/"))
+        await started.wait()
+        assert not breaker.allow_request()  # the trial is in flight
+
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        await client.close()
+        return breaker
+
+    breaker = asyncio.run(scenario())
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()  # a new trial may go through
+
+
+def test_half_open_trial_failing_unexpectedly_is_released():
+    async def scenario():
+        def broken(request):
+            raise RuntimeError("unexpected")
+
+        breaker = open_breaker()
+        client = make_client(broken, breaker)
+        with pytest.raises(RuntimeError):
+            await client.get_json("/topics/")
+        await client.close()
+        return breaker
+
+    breaker = asyncio.run(scenario())
+    assert breaker.allow_request()
+
+
+def test_successful_half_open_trial_closes_the_circuit():
+    async def scenario():
+        breaker = open_breaker()
+        client = make_client(lambda request: httpx.Response(200, json=[]), breaker)
+        assert await client.get_json("/topics/") == []
+        await client.close()
+        return breaker
+
+    assert asyncio.run(scenario()).state == CircuitBreaker.CLOSED
@@ -0,0 +1,32 @@
+"""
+Statement shapes used to spot repeated (N+1) queries.
+
+    cd quiz-service/quiz && python -m pytest tests
+"""
+import pytest
+
+from monitoring.sqlstats import statement_shape
+
+
+@pytest.mark.parametrize("statement, shape", [
+    ("SELECT * FROM quizzes WHERE id IN ($1, $2, $3)", "SELECT * FROM quizzes WHERE id IN (?)"),
+    ("SELECT * FROM quizzes WHERE id IN (%(id_1)s)", "SELECT * FROM quizzes WHERE id IN (?)"),
+    ("SELECT * FROM answers WHERE id IN ($1::VARCHAR, $2::VARCHAR)", "SELECT * FROM answers WHERE id IN (?)"),
+    ("SELECT * FROM quiz_sessions WHERE id = ANY ($1::VARCHAR[])", "SELECT * FROM quiz_sessions WHERE id = ANY (?)"),
+    (
+        "INSERT INTO answers (id, selected_option, answered_at)\n"
+        "  SELECT * FROM (VALUES ($1::VARCHAR, $2::INTEGER, $3::TIMESTAMP WITHOUT TIME ZONE),"
+        " ($4::VARCHAR, $5::INTEGER, $6::TIMESTAMP WITHOUT TIME ZONE)) AS incoming",
+        "INSERT INTO answers (id, selected_option, answered_at) SELECT * FROM (VALUES (?)) AS incoming",
+    ),
+    ("SELECT lower(name) FROM topics WHERE name = $1", "SELECT lower(name) FROM topics WHERE name = $1"),
+])
+def test_statement_shape(statement, shape):
+    assert statement_shape(statement) == shape
+
+
+def test_casted_lists_of_any_length_share_a_shape():
+    def select_in(n):
+        return "SELECT * FROM quiz_questions WHERE id IN (" + ", ".join(f"${i}::VARCHAR" for i in range(1, n + 1)) + ")"
+
+    assert len({statement_shape(select_in(n)) for n in (1, 2, 10)}) == 1